@@ -9,6 +9,9 @@ if TYPE_CHECKING:
     from engine import Engine
     from entity import Actor, Entity, Item
 
+# 근접 공격 소리가 들리는 거리, 이 안의 잠든 적이 깨어난다.
+MELEE_NOISE_RADIUS = 6
+
 class Action:
     def __init__(self, entity:Actor) -> None:
             super().__init__
@@ -31,6 +34,23 @@ class Action:
         """
         raise NotImplementedError()
 
+    def attack(self, target: Actor, verb: str) -> None:
+        """entity가 target을 공격해서 피해를 주고 메세지를 남김, verb는 메세지의 동사(attacks, shoots 등)"""
+        damage = self.entity.fighter.power - target.fighter.defense
+
+        attack_desc = f"{self.entity.name.capitalize()} {verb} {target.name}"
+
+        if self.entity is self.engine.player:
+            attack_color = color.player_atk
+        else:
+            attack_color = color.enemy_atk
+
+        if damage > 0:
+            self.engine.message_log.add_message(f"{attack_desc} for {damage} hit points.", attack_color)
+            target.fighter.hp -= damage
+        else:
+            self.engine.message_log.add_message(f"{attack_desc} but does no damage.", attack_color)
+
 class PickupAction(Action):
     def __init__(self, entity:Actor):
         super().__init__(entity)
@@ -40,17 +60,15 @@ class PickupAction(Action):
         actor_location_y = self.entity.y
         inventory = self.entity.inventory
 
-        for item in self.engine.game_map.items:
-            if actor_location_x == item.x and actor_location_y == item.y:
-                if len(inventory.items) >= inventory.capacity:
-                    raise exceptions.Impossible("Your inventory is full.")
+        for item in self.engine.game_map.get_items_at_location(actor_location_x, actor_location_y):
+            if not inventory.find_stack(item) and len(inventory.items) >= inventory.capacity:
+                raise exceptions.Impossible("Your inventory is full.")
 
-                self.engine.game_map.entities.remove(item)
-                item.parent = self.entity.inventory
-                inventory.items.append(item)
+            self.engine.game_map.remove_entity(item)
+            inventory.add(item)
 
-                self.engine.message_log.add_message(f"You picked up the {item.name}!")
-                return
+            self.engine.message_log.add_message(f"You picked up the {item.display_name}!")
+            return
 
         raise exceptions.Impossible("There is nothing here to pick up.")
 
@@ -134,20 +152,24 @@ class MeleeAction(ActionWithDirection):
         if not target:
             raise exceptions.Impossible("Nothing to attack.")
 
-        damage = self.entity.fighter.power - target.fighter.defense
-        
-        attack_desc = f"{self.entity.name.capitalize()} attacks {target.name}"
-        
-        if self.entity is self.engine.player:
-            attack_color = color.player_atk
-        else:
-            attack_color = color.enemy_atk
+        self.attack(target, "attacks")
+        self.engine.game_map.make_noise(self.entity.x, self.entity.y, MELEE_NOISE_RADIUS)
 
-        if damage > 0:
-            self.engine.message_log.add_message(f"{attack_desc} for {damage} hit points.", attack_color)
-            target.fighter.hp -= damage
-        else:
-            self.engine.message_log.add_message(f"{attack_desc} but does no damage.", attack_color)
+
+class RangedAttackAction(Action):
+    """떨어진 target을 공격, 시선과 사거리는 부르는 쪽에서 확인한다."""
+
+    def __init__(self, entity: Actor, target: Actor):
+        super().__init__(entity)
+
+        self.target = target
+
+    def perform(self) -> None:
+        target = self.target
+        if not target.is_alive:
+            raise exceptions.Impossible("Nothing to attack.")
+
+        self.attack(target, "shoots")
 
 
 class MovementAction(ActionWithDirection):
@@ -162,7 +184,7 @@ class MovementAction(ActionWithDirection):
             # 목적지가 타일에 의해 막혀있음
             raise exceptions.Impossible("That way is blocked!")
 
-        if self.engine.game_map.get_blocking_entity_at_location(dest_x, dest_y):
+        if self.engine.game_map.occupancy[dest_x, dest_y]:
             # 목적지가 엔티티에 의해 막혀있음
             raise exceptions.Impossible("That way is blocked!")
 
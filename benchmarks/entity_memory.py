@@ -0,0 +1,133 @@
+"""
+엔티티 하나당 메모리 사용량과 spawn 속도를 __slots__와 프로토타입 복제 이전 방식과 비교하는 벤치마크.
+
+저장소 최상위 폴더에서 `python -m benchmarks.entity_memory`로 실행.
+이전 방식은 같은 프로세스 안에서 흉내낸다.
+메모리는 템플릿을 슬롯 대신 __dict__에 같은 속성을 가진 쌍둥이 객체로 바꿔서 copy.deepcopy한 크기를 재고,
+spawn은 예전 Entity.spawn처럼 copy.deepcopy로 복제해서 맵에 놓는 속도를 잰다.
+"""
+from __future__ import annotations
+
+import copy
+import enum
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import entity_factories
+from entity import Entity
+from game_map import GameMap
+
+NUMBER_OF_ENTITIES = 5_000
+
+_twin_classes: Dict[type, type] = {}
+
+
+def slotted_names(cls: type) -> List[str]:
+    """클래스와 부모 클래스에 선언된 모든 슬롯 이름을 리턴, parent도 포함한다."""
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def dict_twin(value: object, memo: Dict[int, object]) -> object:
+    """
+    슬롯을 쓰는 객체를 같은 속성을 __dict__에 가진 쌍둥이 객체로 바꾼 복제본을 리턴, 다른 값은 그대로 둔다.
+
+    컴포넌트의 parent나 AI의 entity처럼 서로를 가리키는 참조도 쌍둥이끼리 가리키게 한다.
+    """
+    if id(value) in memo:
+        return memo[id(value)]
+
+    if isinstance(value, list):
+        twin_list: List[object] = []
+        memo[id(value)] = twin_list
+        twin_list.extend(dict_twin(item, memo) for item in value)
+        return twin_list
+    if isinstance(value, dict):
+        twin_dict: Dict[object, object] = {}
+        memo[id(value)] = twin_dict
+        twin_dict.update((key, dict_twin(item, memo)) for key, item in value.items())
+        return twin_dict
+
+    cls = type(value)
+    if hasattr(cls, "__slots__") and not hasattr(value, "__dict__"):
+        twin_cls = _twin_classes.get(cls)
+        if twin_cls is None:
+            twin_cls = _twin_classes[cls] = type(cls.__name__, (), {})
+        twin = memo[id(value)] = twin_cls()
+        for name in slotted_names(cls):
+            if hasattr(value, name):
+                setattr(twin, name, dict_twin(getattr(value, name), memo))
+        return twin
+    if hasattr(value, "__dict__") and not isinstance(value, (type, enum.Enum)):
+        # AI처럼 원래 __dict__를 쓰는 객체는 그 안의 참조만 쌍둥이로 바꾼다.
+        twin = memo[id(value)] = object.__new__(cls)
+        twin.__dict__.update((name, dict_twin(item, memo)) for name, item in vars(value).items())
+        return twin
+    return value
+
+
+def bytes_per_entity(clone: Callable[[], object], number_of_entities: int) -> float:
+    """`clone`이 만든 복제(컴포넌트 포함) 하나가 차지하는 평균 바이트 수를 리턴"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    clones = [clone() for _ in range(number_of_entities)]
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del clones
+
+    return (after - before) / number_of_entities
+
+
+def deepcopy_spawn(template: Entity, game_map: GameMap, x: int, y: int) -> Entity:
+    """예전 Entity.spawn: copy.deepcopy로 복제해서 배치"""
+    clone = copy.deepcopy(template)
+    clone.x = x
+    clone.y = y
+    clone.parent = game_map
+    game_map.add_entity(clone)
+    return clone
+
+
+def spawns_per_second(spawn: Callable[[GameMap, int, int], Entity], number_of_entities: int) -> float:
+    """`spawn`으로 맵에 배치하는 초당 횟수를 리턴"""
+    side = int(number_of_entities ** 0.5) + 1
+    game_map = GameMap(None, side, side)
+
+    start = time.perf_counter()
+    for i in range(number_of_entities):
+        spawn(game_map, i % side, i // side)
+    elapsed = time.perf_counter() - start
+
+    return number_of_entities / elapsed
+
+
+def main() -> None:
+    print(f"{NUMBER_OF_ENTITIES} entities per template")
+    print(f"{'':<16} {'bytes/entity':>21} {'spawns/s':>25}")
+    print(f"{'':<16} {'before':>10} {'after':>10} {'before':>12} {'after':>12}")
+    for name in ("orc", "troll", "health_potion", "fireball_scroll", "sword"):
+        template = getattr(entity_factories, name)
+        twin = dict_twin(template, {})
+        bytes_before = bytes_per_entity(lambda: copy.deepcopy(twin), NUMBER_OF_ENTITIES)
+        bytes_after = bytes_per_entity(template.clone, NUMBER_OF_ENTITIES)
+        spawns_before = spawns_per_second(
+            lambda game_map, x, y: deepcopy_spawn(template, game_map, x, y), NUMBER_OF_ENTITIES)
+        spawns_after = spawns_per_second(template.spawn, NUMBER_OF_ENTITIES)
+        print(
+            f"{name:<16} {bytes_before:10.0f} {bytes_after:10.0f}"
+            f" {spawns_before:12.0f} {spawns_after:12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+플레이어 시야 갱신의 비용을 맵 전체에서 계산하는 방식과 플레이어 주위 창에서만 계산하는 방식으로 비교하는 벤치마크.
+
+저장소 최상위 폴더에서 `python -m benchmarks.fov`로 실행.
+모든 방식이 시야 계산과 visible, explored 갱신까지 잰다. Engine.update_fov의 키 비교는 거치지 않는다.
+마지막 방식은 창 계산에 GameMap.fov_cache와 같은 시점별 LRU 캐시를 더한다. 무작위 걸음은 같은 타일을 자주 다시 밟는다.
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from tcod.map import compute_fov
+
+from engine import FOV_RADIUS
+from fov import FovCache, compute_fov_window
+
+MAP_SIZES = ((80, 43), (500, 500), (2_000, 2_000))
+STEPS = 200
+FOV_CACHE_SIZE = 1024
+
+
+def make_map(width: int, height: int) -> np.ndarray:
+    """벽이 드문드문 있는 투명도 배열을 리턴"""
+    rng = np.random.default_rng(0)
+    return np.asfortranarray(rng.random((width, height)) > 0.2)
+
+
+def random_walk(width: int, height: int) -> List[Tuple[int, int]]:
+    random.seed(0)
+    x, y = width // 2, height // 2
+    positions = []
+    for _ in range(STEPS):
+        x = min(width - 1, max(0, x + random.choice((-1, 0, 1))))
+        y = min(height - 1, max(0, y + random.choice((-1, 0, 1))))
+        positions.append((x, y))
+    return positions
+
+
+def full_map(transparency: np.ndarray, positions: List[Tuple[int, int]]) -> np.ndarray:
+    """기존 방식: 맵 전체에서 계산하고 visible 전체를 덮어쓰고 explored 전체에 OR"""
+    visible = np.zeros(transparency.shape, dtype=bool, order="F")
+    explored = np.zeros(transparency.shape, dtype=bool, order="F")
+    for x, y in positions:
+        visible[:] = compute_fov(transparency, (x, y), radius=FOV_RADIUS)
+        explored |= visible
+    return explored
+
+
+def windowed(
+    transparency: np.ndarray, positions: List[Tuple[int, int]], fov_cache: Optional[FovCache] = None,
+) -> np.ndarray:
+    """Engine.update_fov 방식: 창에서만 계산하고 지난 창과 이번 창만 쓴다."""
+    visible = np.zeros(transparency.shape, dtype=bool, order="F")
+    explored = np.zeros(transparency.shape, dtype=bool, order="F")
+    previous_window = None
+    for x, y in positions:
+        if previous_window is not None:
+            visible[previous_window] = False
+        cached = fov_cache.get((x, y)) if fov_cache is not None else None
+        if cached is not None:
+            window, fov = cached
+        else:
+            window, fov = compute_fov_window(transparency, x, y, FOV_RADIUS)
+            if fov_cache is not None:
+                fov_cache.put((x, y), window, fov)
+        visible[window] = fov
+        explored[window] |= fov
+        previous_window = window
+    return explored
+
+
+def main() -> None:
+    print(f"{STEPS} steps, radius {FOV_RADIUS}")
+    for width, height in MAP_SIZES:
+        transparency = make_map(width, height)
+        positions = random_walk(width, height)
+        print(f"{width}x{height}")
+        results = []
+        function: Callable[[np.ndarray, List[Tuple[int, int]]], np.ndarray]
+        fov_cache = FovCache(FOV_CACHE_SIZE)
+        cached: Callable[[np.ndarray, List[Tuple[int, int]]], np.ndarray] = (
+            lambda transparency, positions: windowed(transparency, positions, fov_cache))
+        for label, function in (("full map", full_map), ("window", windowed), ("window + LRU", cached)):
+            start = time.perf_counter()
+            results.append(function(transparency, positions))
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<14} {elapsed / STEPS * 1_000_000:10.1f} us/step")
+        print(f"  same explored tiles: {all(np.array_equal(results[0], result) for result in results[1:])}")
+        print(
+            f"  LRU: {fov_cache.hits} hits, {fov_cache.misses} misses, {len(fov_cache)} entries, {fov_cache.nbytes} bytes")
+
+
+if __name__ == "__main__":
+    main()
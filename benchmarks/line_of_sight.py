@@ -0,0 +1,93 @@
+"""
+원거리 공격하는 적들의 시선 확인 비용을 적마다 선을 긋는 방식과 비교하는 벤치마크.
+
+저장소 최상위 폴더에서 `python -m benchmarks.line_of_sight`로 실행.
+적마다 플레이어까지 bresenham 선을 걸으며 벽을 확인하는 방식과,
+Engine.get_actors_in_line_of_sight로 플레이어에게서 한번 shadowcast하고 배열로 읽는 방식을 잰다.
+두 방식은 같은 유클리드 반지름 안에서만 확인하고, 마지막에 시선이 트인 궁수가 같은지 출력한다.
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import List
+
+import tcod
+
+import entity_factories
+from engine import Engine, FOV_RADIUS
+from entity import Actor
+from game_map import GameMap
+import tile_types
+
+MAP_SIZE = 200
+ARCHER_COUNTS = (50, 500, 5_000)
+TURNS = 20
+
+
+def build_engine(number_of_archers: int) -> Engine:
+    """벽이 드문드문 있는 넓은 맵에서 플레이어 주위에 궁수를 흩어 놓은 엔진을 리턴"""
+    random.seed(0)
+    engine = Engine(player=entity_factories.player.clone())
+    game_map = GameMap(engine, MAP_SIZE, MAP_SIZE)
+    game_map.tiles[1:-1, 1:-1] = tile_types.floor
+    for _ in range(MAP_SIZE * MAP_SIZE // 10):
+        game_map.tiles[random.randrange(MAP_SIZE), random.randrange(MAP_SIZE)] = tile_types.wall
+    engine.game_map = game_map
+
+    center = MAP_SIZE // 2
+    game_map.tiles[center, center] = tile_types.floor
+    engine.player.place(center, center, game_map)
+    locations = set()
+    while len(locations) < number_of_archers:
+        x, y = random.randrange(1, MAP_SIZE - 1), random.randrange(1, MAP_SIZE - 1)
+        if game_map.tiles["walkable"][x, y] and (x, y) != (center, center):
+            locations.add((x, y))
+    entity_factories.archer.spawn_many(game_map, sorted(locations))
+    return engine
+
+
+def in_radius(dx: int, dy: int) -> bool:
+    """tcod의 시야 계산과 같은 유클리드 반지름 확인, 반지름 FOV_RADIUS의 원 경계 위의 타일은 빠진다."""
+    return dx * dx + dy * dy < FOV_RADIUS * FOV_RADIUS
+
+
+def ray_per_archer(engine: Engine, archers: List[Actor]) -> List[Actor]:
+    """기존 방식: 사거리 안의 적마다 플레이어까지 선을 걷는다."""
+    transparent = engine.game_map.tiles["transparent"]
+    player = engine.player
+    seen = []
+    for archer in archers:
+        if not in_radius(archer.x - player.x, archer.y - player.y):
+            continue
+        line = tcod.los.bresenham((archer.x, archer.y), (player.x, player.y))[1:-1]
+        if transparent[line[:, 0], line[:, 1]].all():
+            seen.append(archer)
+    return seen
+
+
+def sight_map(engine: Engine, archers: List[Actor]) -> List[Actor]:
+    """Engine의 공유 시야 지도에서 한번에 읽는다. 플레이어가 움직인 턴처럼 매번 다시 계산한다."""
+    engine._player_sight_map_key = None
+    return engine.get_actors_in_line_of_sight(archers)
+
+
+def main() -> None:
+    print(f"{MAP_SIZE}x{MAP_SIZE} map, {TURNS} turns")
+    for number_of_archers in ARCHER_COUNTS:
+        engine = build_engine(number_of_archers)
+        archers = [actor for actor in engine.game_map.actors if actor is not engine.player]
+        print(f"{number_of_archers} archers")
+        results = []
+        for label, function in (("ray per archer", ray_per_archer), ("shared sight map", sight_map)):
+            start = time.perf_counter()
+            for _ in range(TURNS):
+                seen = function(engine, archers)
+            elapsed = time.perf_counter() - start
+            results.append(set(seen))
+            print(f"  {label:<18} {elapsed / TURNS * 1000:8.3f} ms/turn {len(seen):6} in sight")
+        print(f"  same archers in sight: {results[0] == results[1]} ({len(results[0] ^ results[1])} differ)")
+
+
+if __name__ == "__main__":
+    main()
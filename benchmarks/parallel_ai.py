@@ -0,0 +1,78 @@
+"""
+적의 행동을 스레드 풀에서 나눠 결정할 때(Engine.ai_workers)의 적 턴 시간을 재는 벤치마크.
+
+저장소 최상위 폴더에서 `python -m benchmarks.parallel_ai`로 실행.
+모든 적이 플레이어를 보고 각자 경로를 계산하는(use_player_distance_map = False) 큰 맵에서 잰다.
+여러 코어가 있는 컴퓨터에서만 빨라진다.
+"""
+from __future__ import annotations
+
+import os
+import random
+import time
+
+import entity_factories
+from engine import Engine
+from game_map import GameMap
+import tile_types
+
+MAP_SIZE = 200
+NUMBER_OF_ENEMIES = 300
+TURNS = 5
+WORKER_COUNTS = (0, 2, 4, 8)
+
+
+def build_engine(ai_workers: int) -> Engine:
+    """벽이 드문드문 있는 넓은 맵에 적을 흩어 놓은 엔진을 리턴"""
+    random.seed(0)
+    engine = Engine(player=entity_factories.player.clone())
+    engine.use_player_distance_map = False
+    engine.ai_workers = ai_workers
+
+    game_map = GameMap(engine, MAP_SIZE, MAP_SIZE)
+    game_map.tiles[1:-1, 1:-1] = tile_types.floor
+    for _ in range(MAP_SIZE * MAP_SIZE // 20):
+        game_map.tiles[random.randrange(MAP_SIZE), random.randrange(MAP_SIZE)] = tile_types.wall
+    game_map.tiles_changed()
+    engine.game_map = game_map
+
+    engine.player.place(MAP_SIZE // 2, MAP_SIZE // 2, game_map)
+    engine.player.fighter.max_hp = engine.player.fighter.hp = 10 ** 6
+    locations = set()
+    while len(locations) < NUMBER_OF_ENEMIES:
+        x, y = random.randrange(1, MAP_SIZE - 1), random.randrange(1, MAP_SIZE - 1)
+        if game_map.tiles["walkable"][x, y] and (x, y) != (engine.player.x, engine.player.y):
+            locations.add((x, y))
+    entity_factories.orc.spawn_many(game_map, sorted(locations))
+
+    # 시야 인덱스를 이 맵으로 만들어 둬야 handle_enemy_turns가 시야를 다시 계산해서 visible을 덮어쓰지 않는다.
+    engine.update_fov()
+    game_map.visible[:] = True  # 모든 적이 플레이어를 본다.
+    return engine
+
+
+def main() -> None:
+    print(f"{MAP_SIZE}x{MAP_SIZE} map, {NUMBER_OF_ENEMIES} enemies, {TURNS} turns, {os.cpu_count()} CPUs")
+    for ai_workers in WORKER_COUNTS:
+        engine = build_engine(ai_workers)
+        player = engine.player
+        rng = random.Random(1)
+
+        enemies = [actor for actor in engine.game_map.actors if actor is not player]
+        start = time.perf_counter()
+        for _ in range(TURNS):
+            # 플레이어가 멀리 움직여서 매 턴 모든 적이 경로를 다시 계산하게 한다.
+            while True:
+                x, y = rng.randrange(1, MAP_SIZE - 1), rng.randrange(1, MAP_SIZE - 1)
+                if engine.game_map.passable[x, y]:
+                    break
+            player.place(x, y)
+            engine.handle_enemy_turns()
+        elapsed = time.perf_counter() - start
+
+        path_recomputes = sum(enemy.ai.path_recomputes for enemy in enemies)
+        print(f"ai_workers={ai_workers:<2} {elapsed / TURNS * 1000:8.2f} ms/turn {path_recomputes / TURNS:6.0f} paths/turn")
+
+
+if __name__ == "__main__":
+    main()
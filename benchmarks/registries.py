@@ -0,0 +1,81 @@
+"""
+GameMap의 종류별 엔티티 목록과 기존의 전체 엔티티 스캔을 비교하는 벤치마크.
+
+저장소 최상위 폴더에서 `python -m benchmarks.registries`로 실행.
+"""
+from __future__ import annotations
+
+import random
+import timeit
+from typing import Iterator
+
+import entity_factories
+from entity import Actor, Item
+from game_map import GameMap
+
+NUMBER_OF_ENTITIES = 10_000
+REPEAT = 20
+
+
+def scan_actors(game_map: GameMap) -> Iterator[Actor]:
+    """기존 방식: 모든 엔티티를 훑어 살아있는 Actor를 찾음"""
+    yield from (entity for entity in game_map.entities if isinstance(entity, Actor) and entity.is_alive)
+
+
+def scan_items(game_map: GameMap) -> Iterator[Item]:
+    """기존 방식: 모든 엔티티를 훑어 아이템을 찾음"""
+    yield from (entity for entity in game_map.entities if isinstance(entity, Item))
+
+
+def build_map(number_of_entities: int) -> GameMap:
+    """actor, 시체, 아이템이 섞인 큰 맵을 생성"""
+    side = int(number_of_entities ** 0.5) * 2
+    game_map = GameMap(None, side, side)
+    templates = [entity_factories.orc, entity_factories.troll, entity_factories.health_potion]
+
+    for _ in range(number_of_entities):
+        entity = random.choice(templates).spawn(game_map, random.randrange(side), random.randrange(side))
+        if isinstance(entity, Actor) and random.random() < 0.5:
+            # 절반은 시체로 만든다. (메세지나 경험치 없이)
+            entity.ai = None
+            entity.blocks_movement = False
+            game_map.refresh_entity(entity)
+
+    return game_map
+
+
+def report(label: str, old_seconds: float, new_seconds: float) -> None:
+    print(
+        f"{label:<24} scan: {old_seconds / REPEAT * 1000:8.3f} ms"
+        f"  registry: {new_seconds / REPEAT * 1000:8.3f} ms"
+        f"  x{old_seconds / new_seconds:.1f}"
+    )
+
+
+def main() -> None:
+    random.seed(0)
+    game_map = build_map(NUMBER_OF_ENTITIES)
+    player = next(iter(game_map.actors))
+
+    print(f"{NUMBER_OF_ENTITIES} entities, {REPEAT} repeats")
+
+    report(
+        "actors",
+        timeit.timeit(lambda: sum(1 for _ in scan_actors(game_map)), number=REPEAT),
+        timeit.timeit(lambda: sum(1 for _ in game_map.actors), number=REPEAT),
+    )
+    report(
+        "items",
+        timeit.timeit(lambda: sum(1 for _ in scan_items(game_map)), number=REPEAT),
+        timeit.timeit(lambda: sum(1 for _ in game_map.items), number=REPEAT),
+    )
+    # Engine.handle_enemy_turns의 이전 방식과 현재 방식
+    report(
+        "enemy turn iteration",
+        timeit.timeit(lambda: sum(1 for _ in set(scan_actors(game_map)) - {player}), number=REPEAT),
+        timeit.timeit(lambda: sum(1 for actor in game_map.actors if actor is not player), number=REPEAT),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+큰 던전에서 먼 거리 경로를 맵 전체에서 찾을 때와 방 그래프(GameMap.find_path)로 찾을 때를 비교하는 벤치마크.
+
+저장소 최상위 폴더에서 `python -m benchmarks.room_paths`로 실행.
+방 그래프의 경로가 얼마나 긴지(가장 짧은 경로 대비)도 출력한다.
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import List, Tuple
+
+import tcod
+
+import entity_factories
+from engine import Engine
+from game_map import GameMap, GameWorld, ROOM_PATH_MIN_DISTANCE
+from room_graph import path_cost
+
+MAP_SIZE = 300
+MAX_ROOMS = 600
+QUERIES = 200
+
+
+def full_grid_path(game_map: GameMap, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """기존 방식: 맵 전체 그래프에서 경로를 찾음"""
+    pathfinder = tcod.path.Pathfinder(game_map.get_path_graph())
+    pathfinder.add_root(start)
+    return [(x, y) for x, y in pathfinder.path_to(goal)[1:].tolist()]
+
+
+def is_valid(game_map: GameMap, path: List[Tuple[int, int]], start: Tuple[int, int], goal: Tuple[int, int]) -> bool:
+    """경로가 한칸씩 걸을 수 있는 타일만 지나 목표에 닿으면 True를 리턴"""
+    for x, y in path:
+        if max(abs(x - start[0]), abs(y - start[1])) != 1 or not game_map.tiles["walkable"][x, y]:
+            return False
+        start = x, y
+    return start == goal
+
+
+def main() -> None:
+    random.seed(0)
+    engine = Engine(player=entity_factories.player.clone())
+    engine.game_world = GameWorld(
+        engine=engine, map_width=MAP_SIZE, map_height=MAP_SIZE, max_rooms=MAX_ROOMS, room_min_size=6, room_max_size=10,
+    )
+    engine.game_world.generate_floor()
+    game_map = engine.game_map
+    game_map.get_path_graph()
+
+    walkable = list(zip(*game_map.tiles["walkable"].nonzero()))
+    queries = []
+    while len(queries) < QUERIES:
+        start, goal = random.choice(walkable), random.choice(walkable)
+        if max(abs(start[0] - goal[0]), abs(start[1] - goal[1])) >= ROOM_PATH_MIN_DISTANCE:
+            queries.append(((int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))))
+
+    start_time = time.perf_counter()
+    full_paths = [full_grid_path(game_map, start, goal) for start, goal in queries]
+    full_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    room_paths = [game_map.find_path(*start, *goal) for start, goal in queries]
+    room_seconds = time.perf_counter() - start_time
+
+    ratios = [
+        path_cost(room_path, start) / path_cost(full_path, start)
+        for (start, _), full_path, room_path in zip(queries, full_paths, room_paths) if full_path
+    ]
+    print(f"{MAP_SIZE}x{MAP_SIZE} map, {len(game_map.room_graph.rooms)} rooms, {QUERIES} queries")
+    print(f"full grid   {full_seconds / QUERIES * 1000:8.3f} ms/path")
+    print(f"room graph  {room_seconds / QUERIES * 1000:8.3f} ms/path  x{full_seconds / room_seconds:.1f}")
+    print(f"room graph path cost: {sum(ratios) / len(ratios):.3f}x average, {max(ratios):.3f}x worst of shortest")
+    invalid = sum(not is_valid(game_map, path, start, goal) for (start, goal), path in zip(queries, room_paths))
+    print(f"invalid room graph paths: {invalid}")
+
+
+if __name__ == "__main__":
+    main()
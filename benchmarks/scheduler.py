@@ -0,0 +1,138 @@
+"""
+TurnScheduler의 플레이어 한 턴당 비용을 기존의 전체 Actor 순회, 에너지 스캔과 비교하는 벤치마크.
+
+저장소 최상위 폴더에서 `python -m benchmarks.scheduler`로 실행.
+AI는 실행하지 않고 행동 순서를 정하는 비용과 방문하는 Actor 수만 잰다.
+마지막으로 Engine의 적 턴에서 Haste(N)이 행동을 정확히 N번 늘리는지 확인한다.
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, List, Set
+
+from components.ai import BaseAI
+from engine import Engine
+import entity_factories
+from entity import Actor
+from game_map import GameMap
+from status_effects import Haste
+import tile_types
+from turn_scheduler import ACTION_COST, NORMAL_SPEED, TurnScheduler
+
+ACTOR_COUNTS = (1_000, 5_000, 20_000)
+AWAKE_RATIOS = (0.01, 0.1)  # 깨어있는(예약된) Actor의 비율
+TURNS = 50
+HASTE_DURATIONS = (1, 2, 3, 5)
+HASTE_CHECK_TURNS = 8  # 가장 긴 가속보다 길어야 한다.
+
+
+class CountingAI(BaseAI):
+    """행동하지 않고 차례가 온 횟수만 센다."""
+
+    def __init__(self, entity: Actor):
+        super().__init__(entity)
+        self.turns = 0
+
+    def perform(self) -> None:
+        self.turns += 1
+
+
+def make_actors(number_of_actors: int) -> List[Actor]:
+    """보통, 빠름, 느림이 섞인 Actor 목록을 리턴"""
+    actors = []
+    for _ in range(number_of_actors):
+        actor = entity_factories.orc.clone()
+        actor.speed = random.choice((NORMAL_SPEED // 2, NORMAL_SPEED, NORMAL_SPEED, NORMAL_SPEED * 2))
+        actors.append(actor)
+    return actors
+
+
+def scan_all(actors: List[Actor], awake: Set[Actor]) -> int:
+    """기존 방식: 매 턴 모든 Actor를 방문하고 한번씩 행동"""
+    visits = 0
+    for _ in range(TURNS):
+        for actor in set(actors):
+            if actor.ai:
+                visits += 1
+    return visits
+
+
+def energy_scan(actors: List[Actor], awake: Set[Actor]) -> int:
+    """힙 없는 에너지 방식: 매 턴 모든 Actor를 훑어 깨어있는 Actor에게 에너지를 주고, 다 찬 Actor가 행동"""
+    energy = {actor: 0 for actor in actors}
+    visits = 0
+    for _ in range(TURNS):
+        for actor in actors:
+            visits += 1
+            if actor not in awake:
+                continue
+            energy[actor] += actor.speed * ACTION_COST // NORMAL_SPEED
+            while energy[actor] >= ACTION_COST:
+                energy[actor] -= ACTION_COST
+    return visits
+
+
+def heap_scheduler(actors: List[Actor], awake: Set[Actor]) -> int:
+    """TurnScheduler: 예약된 Actor만 차례 순서대로 꺼냄"""
+    player = entity_factories.player.clone()
+    scheduler = TurnScheduler()
+    scheduler.schedule(player)
+    for actor in actors:
+        if actor in awake:
+            scheduler.schedule(actor)
+
+    visits = 0
+    for _ in range(TURNS):
+        scheduler.schedule(player)
+        for _actor in scheduler.pop_before(player):
+            visits += 1
+    return visits
+
+
+def measure(function: Callable[[List[Actor], Set[Actor]], int], actors: List[Actor], awake: Set[Actor]) -> str:
+    start = time.perf_counter()
+    visits = function(actors, awake)
+    elapsed = time.perf_counter() - start
+    return f"{elapsed / TURNS * 1000:8.3f} ms/turn {visits // TURNS:8} visits/turn"
+
+
+def hasted_turns(duration: int) -> int:
+    """HASTE_CHECK_TURNS번의 적 턴 동안 Actor의 차례 수를 리턴, 첫 적 턴 전에 Haste(duration)을 건다(0이면 안 건다)."""
+    engine = Engine(player=entity_factories.player.clone())
+    game_map = engine.game_map = GameMap(engine, 20, 20)
+    game_map.tiles[1:-1, 1:-1] = tile_types.floor
+    game_map.tiles_changed()
+    engine.player.place(2, 2, game_map)
+    actor = entity_factories.orc.spawn(game_map, 15, 15)
+    actor.ai = ai = CountingAI(actor)
+    engine.update_fov()
+    engine.handle_enemy_turns()  # 보통 속도로 한번 예약된 상태에서 시작
+
+    if duration:
+        game_map.status_effects.apply(actor, Haste(duration))
+    ai.turns = 0
+    for _ in range(HASTE_CHECK_TURNS):
+        engine.handle_enemy_turns()
+    return ai.turns
+
+
+def main() -> None:
+    random.seed(0)
+    print(f"{TURNS} player turns")
+    for number_of_actors in ACTOR_COUNTS:
+        actors = make_actors(number_of_actors)
+        for awake_ratio in AWAKE_RATIOS:
+            awake = {actor for actor in actors if random.random() < awake_ratio}
+            print(f"{number_of_actors} actors, {len(awake)} awake")
+            for label, function in (("scan all", scan_all), ("energy scan", energy_scan), ("heap scheduler", heap_scheduler)):
+                print(f"  {label:<16} {measure(function, actors, awake)}")
+
+    normal_turns = hasted_turns(0)
+    extra_turns = {duration: hasted_turns(duration) - normal_turns for duration in HASTE_DURATIONS}
+    print(f"Haste(N) extra turns over {HASTE_CHECK_TURNS} enemy turns: {extra_turns}")
+    print(f"  Haste(N) gives N extra turns: {all(extra == duration for duration, extra in extra_turns.items())}")
+
+
+if __name__ == "__main__":
+    main()
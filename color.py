@@ -9,6 +9,7 @@ status_effect_applied = (0x3F, 0xFF, 0x3F)
 descend = (0x9F, 0x3f, 0xFF)
 player_die = (0xFF, 0x30, 0x30)
 enemy_die = (0xFF, 0xA0, 0x30)
+enemy_sighted = (0xFF, 0xE0, 0x80)
 
 invalid = (0xFF, 0xFF, 0x00)
 impossible = (0x80, 0x80, 0x80)
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-import random
-from typing import List, Optional, Tuple, TYPE_CHECKING
+from collections import deque
+from typing import Deque, List, Optional, Tuple, TYPE_CHECKING
 
 import numpy as np
-import tcod
 
-from actions import Action, BumpAction, MeleeAction, MovementAction, WaitAction
+from actions import Action, MeleeAction, MovementAction, RangedAttackAction, WaitAction
 
 if TYPE_CHECKING:
     from entity import Actor
 
+# 직선 방향을 대각선보다 먼저 살펴본다.
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+
 
 class BaseAI(Action):
     entity: Actor
@@ -18,83 +20,153 @@ class BaseAI(Action):
     def perform(self) -> None:
         raise NotImplementedError()
 
-    def get_path_to(self, dest_x: int, dest_y: int) -> List[Tuple[int, int]]:
+    def decide(self) -> Optional[Action]:
         """
-            목표 위치로의 경로를 계산하고 리턴
+        이번 차례에 할 행동을 수행하지 않고 골라서 리턴.
 
-            유효한 길이 없으면 빈 리스트를 반환
+        맵과 다른 엔티티는 읽기만 하므로 여러 AI를 동시에 결정할 수 있다. (AI 자신의 상태는 바꿀 수 있다.)
+        None을 리턴하는 AI는 결정을 나눌 수 없어 차례가 오면 perform을 그대로 부른다.
         """
-        # copy the walkable array
-        cost = np.array(self.entity.gamemap.tiles["walkable"], dtype=np.int8)
+        return None
 
-        for entity in self.entity.gamemap.entities:
-            # 엔티티가 경로를 막고, 코스트가 0이 아닐경우(막힘)
-            if entity.blocks_movement and cost[entity.x, entity.y]:
-                # 막힌 경로에 cost 추가
-                # 낮은 숫자는 더 많은 적으로 둘러쌓일 걸을 의미.
-                # 높은 숫자는 적들이 플레이어를 감싸기까지 오래 걸릴것을 의미.
-                cost[entity.x, entity.y] += 10
+    @property
+    def is_idle(self) -> bool:
+        """할 일이 없어 플레이어에게서 멀면 잠들어도 되는 경우 True를 리턴"""
+        return True
 
-        # cost 배열로 그래프 생성, pathfinder는 그래프를 통해 길을 찾는다.
-        graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
-        pathfinder = tcod.path.Pathfinder(graph)
+    def hear_noise(self, x: int, y: int) -> None:
+        """(x, y)에서 난 소리를 들었을 때 호출된다."""
+        pass
 
-        pathfinder.add_root((self.entity.x, self.entity.y))  # 시작위치
+    def clone(self, entity: Actor) -> BaseAI:
+        """주어진 entity를 위한 AI 복제본을 리턴"""
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.entity = entity
+        return clone
 
-        # 목적지까지의 경로를 계산하고 시작지점 삭제
-        path: List[List[int]] = pathfinder.path_to((dest_x, dest_y))[
-            1:].tolist()
+    def get_path_to(self, dest_x: int, dest_y: int) -> List[Tuple[int, int]]:
+        """
+            목표 위치로의 경로를 계산하고 리턴
 
-        # List[List[int]]를 List[Tuple[int,int]]로 변환
-        return [(index[0], index[1]) for index in path]
+            유효한 길이 없으면 빈 리스트를 반환
+        """
+        return self.entity.gamemap.find_path(self.entity.x, self.entity.y, dest_x, dest_y)
 
+    def get_downhill_step(self, distance: np.ndarray, target_x: int, target_y: int) -> Optional[Tuple[int, int]]:
+        """
+            (target_x, target_y)까지의 거리 지도에서 지금보다 값이 낮은 비어있는 이웃 중 가장 낮은 타일로의 방향을 리턴
 
-class ConfusedEnemy(BaseAI):
-    """
-    혼란스러운 적은 주어진 수만큼의 턴 동안 목표없이 방황한다.
-    만약 actor가 랜덤으로 움직일 타일에 있을 경우, 공격한다.
-    """
+            거리 지도는 자기 타일도 막힌 것으로 세므로, 자기 값은 이웃에서 한걸음 온 값으로 다시 계산한다.
+            다른 Actor를 피해 목표에서 멀어지는 걸음은 고르지 않는다. 그런 타일이 없으면 None을 반환
+        """
+        gamemap = self.entity.gamemap
+        x, y = self.entity.x, self.entity.y
+        best_step = None
+        best_distance = int(distance[x, y])
+        for dx, dy in DIRECTIONS:
+            next_x, next_y = x + dx, y + dy
+            if gamemap.in_bounds(next_x, next_y) and gamemap.tiles["walkable"][next_x, next_y]:
+                # 경로 그래프와 같이 가로, 세로 2, 대각선 3
+                best_distance = min(best_distance, int(distance[next_x, next_y]) + (3 if dx and dy else 2))
+
+        target_distance = max(abs(target_x - x), abs(target_y - y))
+        for dx, dy in DIRECTIONS:
+            next_x, next_y = x + dx, y + dy
+            if not gamemap.in_bounds(next_x, next_y):
+                continue
+            if not gamemap.tiles["walkable"][next_x, next_y] or gamemap.occupancy[next_x, next_y]:
+                continue
+            if max(abs(target_x - next_x), abs(target_y - next_y)) > target_distance:
+                continue
+            if distance[next_x, next_y] < best_distance:
+                best_step = dx, dy
+                best_distance = distance[next_x, next_y]
+
+        return best_step
+
+    def get_uphill_step(self, field: np.ndarray) -> Optional[Tuple[int, int]]:
+        """
+            `field`(예: 냄새 지도)에서 지금보다 값이 높은 비어있는 이웃 중 가장 높은 타일로의 방향을 리턴
 
-    def __init__(self, entity: Actor, previous_ai: Optional[BaseAI], turns_remaining: int):
-        super().__init__(entity)
+            그런 타일이 없으면 None을 반환
+        """
+        gamemap = self.entity.gamemap
+        x, y = self.entity.x, self.entity.y
+        best_step = None
+        best_value = field[x, y]
 
-        self.previous_ai = previous_ai
-        self.turns_remaining = turns_remaining
+        for dx, dy in DIRECTIONS:
+            next_x, next_y = x + dx, y + dy
+            if not gamemap.in_bounds(next_x, next_y):
+                continue
+            if not gamemap.tiles["walkable"][next_x, next_y] or gamemap.occupancy[next_x, next_y]:
+                continue
+            if field[next_x, next_y] > best_value:
+                best_step = dx, dy
+                best_value = field[next_x, next_y]
 
-    def perform(self) -> None:
-        # 효과가 끝나면 AI를 이전 상태로 돌린다.
-        if self.turns_remaining <= 0:
-            self.engine.message_log.add_message(
-                f"The {self.entity.name} is no longer confused.")
-            self.entity.ai = self.previous_ai
-        else:
-            # 랜덤한 방향을 고른다
-            direction_x, direction_y = random.choice(
-                [
-                    (-1, -1),    # 북서
-                    (0, -1),     # 북
-                    (1, -1),     # 북동
-                    (-1, 0),     # 서
-                    (1, 0),      # 동
-                    (-1, -1),    # 남서
-                    (0, 1),      # 남
-                    (1, 1),      # 남동
-                ]
-            )
-
-            self.turns_remaining -= 1
-
-            # 움직이거나 공격하려는 Actor는 무작위 방향으로 움직인다.
-            # 그냥 벽에 부딪히는 것도 가능하다.
-            return BumpAction(self.entity, direction_x, direction_y).perform()
+        return best_step
 
 
 class HostileEnemy(BaseAI):
+    # 목표가 경로를 계산했을 때의 위치에서 이 거리(chebyshev) 이하로 움직였으면 경로를 재사용한다.
+    path_target_tolerance = 1
+
     def __init__(self, entity: Actor):
         super().__init__(entity)
-        self.path: List[Tuple[int, int]] = []
-
-    def perform(self) -> None:
+        self.path: Deque[Tuple[int, int]] = deque()
+        self.path_target: Optional[Tuple[int, int]] = None  # 현재 경로를 계산한 목표 위치
+        # 공유 거리 지도를 쓸 때, 플레이어를 마지막으로 본 위치
+        self.last_seen_xy: Optional[Tuple[int, int]] = None
+
+        # 경로 캐시 통계
+        self.path_cache_hits = 0
+        self.path_recomputes = 0
+
+    def clone(self, entity: Actor) -> HostileEnemy:
+        clone = super().clone(entity)
+        clone.path = deque(self.path)
+        return clone
+
+    @property
+    def is_idle(self) -> bool:
+        if self.path or self.last_seen_xy is not None:
+            return False
+        # 냄새 위에 있으면 따라갈 곳이 있다.
+        return not (self.engine.use_scent_map and self.entity.gamemap.scent[self.entity.x, self.entity.y])
+
+    def hear_noise(self, x: int, y: int) -> None:
+        # 소리가 난 곳을 플레이어를 마지막으로 본 곳처럼 찾아간다.
+        self.last_seen_xy = x, y
+
+    def is_path_valid(self, dest_x: int, dest_y: int) -> bool:
+        """현재 경로를 (dest_x, dest_y)로 가는데 계속 쓸 수 있으면 True를 리턴"""
+        if not self.path or self.path_target is None:
+            return False
+
+        target_x, target_y = self.path_target
+        if max(abs(dest_x - target_x), abs(dest_y - target_y)) > self.path_target_tolerance:
+            return False
+
+        # 다음 걸음이 바로 옆이고 막혀있지 않아야 한다.
+        next_x, next_y = self.path[0]
+        if max(abs(next_x - self.entity.x), abs(next_y - self.entity.y)) != 1:
+            return False
+        gamemap = self.entity.gamemap
+        return bool(gamemap.tiles["walkable"][next_x, next_y]) and not gamemap.occupancy[next_x, next_y]
+
+    def update_path(self, dest_x: int, dest_y: int) -> None:
+        """목표가 멀리 움직였거나 다음 걸음이 막혔을 때만 경로를 다시 계산"""
+        if self.is_path_valid(dest_x, dest_y):
+            self.path_cache_hits += 1
+            return
+
+        self.path = deque(self.get_path_to(dest_x, dest_y))
+        self.path_target = dest_x, dest_y
+        self.path_recomputes += 1
+
+    def decide(self) -> Action:
         target = self.engine.player
         dx = target.x - self.entity.x
         dy = target.y - self.entity.y
@@ -102,12 +174,54 @@ class HostileEnemy(BaseAI):
 
         if self.engine.game_map.visible[self.entity.x, self.entity.y]:
             if distance <= 1:
-                return MeleeAction(self.entity, dx, dy).perform()
-
-            self.path = self.get_path_to(target.x, target.y)
+                return MeleeAction(self.entity, dx, dy)
+
+            if self.engine.use_player_distance_map:
+                # 모든 적이 공유하는 거리 지도를 따라 내려간다.
+                self.path.clear()
+                self.last_seen_xy = target.x, target.y
+                step = self.get_downhill_step(self.engine.get_player_distance_map(), target.x, target.y)
+                if step:
+                    return MovementAction(self.entity, *step)
+                return WaitAction(self.entity)
+
+            self.update_path(target.x, target.y)
+        else:
+            step = self.get_uphill_step(self.entity.gamemap.scent) if self.engine.use_scent_map else None
+            if step:
+                # 플레이어를 놓치면 경로 계산 없이 냄새가 짙어지는 쪽으로 쫓아간다.
+                self.path.clear()
+                self.last_seen_xy = None
+                return MovementAction(self.entity, *step)
+
+            if self.last_seen_xy:
+                # 냄새가 없으면 마지막으로 본 곳(또는 소리가 난 곳)까지의 경로를 한번 계산한다.
+                self.update_path(*self.last_seen_xy)
+                self.last_seen_xy = None
 
         if self.path:
-            dest_x, dest_y = self.path.pop(0)
-            return MovementAction(self.entity, dest_x - self.entity.x, dest_y - self.entity.y,).perform()
+            dest_x, dest_y = self.path.popleft()
+            return MovementAction(self.entity, dest_x - self.entity.x, dest_y - self.entity.y,)
+
+        return WaitAction(self.entity)
+
+    def perform(self) -> None:
+        return self.decide().perform()
+
+
+class RangedEnemy(HostileEnemy):
+    """사거리 안에서 플레이어와 시선이 트여있으면 멀리서 공격하고, 아니면 HostileEnemy처럼 쫓아간다."""
+    # 원거리 공격의 사거리(chebyshev), Engine.get_player_sight_map의 반지름(FOV_RADIUS)보다 크면 안된다.
+    attack_range = 5
+
+    def decide(self) -> Action:
+        target = self.engine.player
+        distance = max(abs(target.x - self.entity.x), abs(target.y - self.entity.y))
+
+        # 시선은 적마다 선을 긋지 않고 플레이어에게서 한번 계산한 지도에서 읽는다.
+        if 1 < distance <= self.attack_range and self.engine.get_player_sight_map()[self.entity.x, self.entity.y]:
+            self.path.clear()
+            self.last_seen_xy = target.x, target.y
+            return RangedAttackAction(self.entity, target)
 
-        return WaitAction(self.entity).perform()
+        return super().decide()
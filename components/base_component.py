@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TypeVar, TYPE_CHECKING
+
+from prototype import shallow_clone
 
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
     from game_map import GameMap
 
+T = TypeVar("T", bound="BaseComponent")
+
 
 class BaseComponent:
+    __slots__ = ("parent",)
+
     parent: Entity
 
     @property
@@ -18,3 +24,7 @@ class BaseComponent:
     @property
     def engine(self) -> Engine:
         return self.gamemap.engine
+
+    def clone(self: T) -> T:
+        """parent가 없는 컴포넌트 복제본을 리턴"""
+        return shallow_clone(self)
@@ -4,7 +4,6 @@ from typing import Optional, TYPE_CHECKING
 
 import actions
 import color
-import components.ai
 import components.inventory
 from components.base_component import BaseComponent
 from exceptions import Impossible
@@ -13,12 +12,18 @@ from input_handlers import (
     SingleRangedAttackHandler,
     AreaRangedAttackHandler,
 )
+from status_effects import Confusion
 
 if TYPE_CHECKING:
     from entity import Actor, Item
 
+# 폭발과 천둥 소리가 들리는 거리
+LOUD_NOISE_RADIUS = 15
+
 
 class Consumable(BaseComponent):
+    __slots__ = ()
+
     parent: Item
 
     def get_action(self, consumer: Actor) -> Optional[ActionOrHandler]:
@@ -33,14 +38,19 @@ class Consumable(BaseComponent):
         raise NotImplementedError()
 
     def consume(self) -> None:
-        """사용한 아이템을 인벤토리에서 지운다."""
+        """사용한 아이템을 인벤토리에서 지운다. 쌓여있으면 하나만 줄인다."""
         entity = self.parent
         inventory = entity.parent
         if isinstance(inventory, components.inventory.Inventory):
-            inventory.items.remove(entity)
+            if entity.count > 1:
+                entity.count -= 1
+            else:
+                inventory.items.remove(entity)
 
 
 class ConfusionConsumable(Consumable):
+    __slots__ = ("number_of_turns",)
+
     def __init__(self, number_of_turns: int):
         self.number_of_turns = number_of_turns
 
@@ -69,12 +79,13 @@ class ConfusionConsumable(Consumable):
             f"The eyes of the {target.name} look vacent, as it starts to stumble around!",
             color.status_effect_applied
         )
-        target.ai = components.ai.ConfusedEnemy(
-            entity=target, previous_ai=target.ai, turns_remaining=self.number_of_turns,)
+        self.engine.game_map.status_effects.apply(target, Confusion(self.number_of_turns))
         self.consume()
 
 
 class HealingConsumable(Consumable):
+    __slots__ = ("amount",)
+
     def __init__(self, amount: int):
         self.amount = amount
 
@@ -93,6 +104,8 @@ class HealingConsumable(Consumable):
 
 
 class FireballDamageConsumable(Consumable):
+    __slots__ = ("damage", "radius")
+
     def __init__(self, damage: int, radius: int):
         self.damage = damage
         self.radius = radius
@@ -112,41 +125,36 @@ class FireballDamageConsumable(Consumable):
             raise Impossible("You cannot target an area that you cannot see.")
 
         targets_hit = False
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"The {actor.name} is engulfed in a fiery explosion, taking {self.damage} damage!"
-                )
-                actor.fighter.take_damage(self.damage)
-                targets_hit = True
+        for actor in self.engine.game_map.get_actors_within_radius(*target_xy, self.radius):
+            self.engine.message_log.add_message(
+                f"The {actor.name} is engulfed in a fiery explosion, taking {self.damage} damage!"
+            )
+            actor.fighter.take_damage(self.damage)
+            targets_hit = True
 
         if not targets_hit:
             raise Impossible("There are no targets in the radius.")
+        self.engine.game_map.make_noise(*target_xy, LOUD_NOISE_RADIUS)
         self.consume()
 
 
 class LightingDamageConsumable(Consumable):
+    __slots__ = ("damage", "maximum_range")
+
     def __init__(self, damage: int, maximum_range: int):
         self.damage = damage
         self.maximum_range = maximum_range
 
     def activate(self, action: actions.ItemAction) -> None:
         consumer = action.entity
-        target = None
-        closest_distance = self.maximum_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
-
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
+        target = self.engine.game_map.get_nearest_visible_actor(
+            consumer.x, consumer.y, self.maximum_range + 1.0, exclude=consumer)
 
         if target:
             self.engine.message_log.add_message(
                 f"A lighting bolt strikes the {target.name} with a loud thunder, for {self.damage} damage!")
             target.fighter.take_damage(self.damage)
+            self.engine.game_map.make_noise(target.x, target.y, LOUD_NOISE_RADIUS)
             self.consume()
         else:
             raise Impossible("No enemy is close enough to strike")
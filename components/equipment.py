@@ -10,7 +10,10 @@ if TYPE_CHECKING:
 
 
 class Equipment(BaseComponent):
+    __slots__ = ("weapon", "armor")
+
     parent: Actor
+
     def __init__(self, weapon: Optional[Item] = None, armor: Optional[Item] = None):
         self.weapon = weapon
         self.armor = armor
@@ -59,6 +62,7 @@ class Equipment(BaseComponent):
             self.unequip_from_slot(slot, add_message)
 
         setattr(self, slot, item)
+        self.parent.sync_columns()
 
         if add_message:
             self.equip_message(item.name)
@@ -70,6 +74,7 @@ class Equipment(BaseComponent):
             self.unequip_message(current_item.name)
 
         setattr(self, slot, None)
+        self.parent.sync_columns()
 
     def toggle_equip(self, equippable_item: Item, add_message: bool = True) -> None:
         if(equippable_item.equippable and equippable_item.equippable.equipment_types == EquipmentType.WEAPON):
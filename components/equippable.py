@@ -9,6 +9,8 @@ if TYPE_CHECKING:
     from entity import Item
 
 class Equippable(BaseComponent):
+    __slots__ = ("equipment_types", "power_bonus", "defense_bonus")
+
     parent: Item
 
     def __init__(self, equipment_types: Equipment, power_bonus: int = 0, defense_bonus: int = 0,):
@@ -18,20 +20,28 @@ class Equippable(BaseComponent):
         self.defense_bonus = defense_bonus
 
 class Dagger(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_types=EquipmentType.WEAPON, power_bonus=2)
 
 
 class Sword(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_types=EquipmentType.WEAPON, power_bonus=4)
 
 
 class LeatherArmor(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_types=EquipmentType.ARMOR, defense_bonus=1)
 
 
 class ChainMail(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_types=EquipmentType.ARMOR, power_bonus=3)
\ No newline at end of file
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 
 
 class Fighter(BaseComponent):
+    __slots__ = ("max_hp", "_hp", "base_defense", "base_power")
+
     parent: Actor
 
     def __init__(self, hp: int, base_defense: int, base_power: int):
@@ -26,6 +28,7 @@ class Fighter(BaseComponent):
     @hp.setter
     def hp(self, value: int) -> None:
         self._hp = max(0, min(value, self.max_hp))
+        self.parent.sync_columns()
         if self._hp == 0 and self.parent.ai:
             self.die()
 
@@ -65,11 +68,15 @@ class Fighter(BaseComponent):
         self.parent.ai = None
         self.parent.name = f"remains of {self.parent.name}"
         self.parent.render_order = RenderOrder.CORPSE
+        self.gamemap.refresh_entity(self.parent)
 
         self.engine.message_log.add_message(death_message, death_message_color)
 
         self.engine.player.level.add_xp(self.parent.level.xp_given)
 
+        if self.gamemap.compact_corpses and self.engine.player is not self.parent:
+            self.gamemap.compact_corpse(self.parent)
+
     def heal(self, amount: int) -> int:
         if self.hp == self.max_hp:
             return 0
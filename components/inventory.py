@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from components.base_component import BaseComponent
 
@@ -9,15 +9,49 @@ if TYPE_CHECKING:
 
 
 class Inventory(BaseComponent):
+    __slots__ = ("capacity", "items")
+
     parent: Actor
 
     def __init__(self, capacity: int):
         self.capacity = capacity
         self.items: List[Item] = []
 
+    def clone(self) -> Inventory:
+        clone = super().clone()
+        clone.items = []
+        for item in self.items:
+            item_clone = item.clone()
+            item_clone.parent = clone
+            clone.items.append(item_clone)
+        return clone
+
+    def find_stack(self, item: Item) -> Optional[Item]:
+        """인벤토리에서 item과 쌓을 수 있는 아이템을 리턴"""
+        for other in self.items:
+            if other is not item and other.can_stack_with(item):
+                return other
+        return None
+
+    def add(self, item: Item) -> None:
+        """아이템을 인벤토리에 넣는다. 같은 아이템이 있으면 그 위에 쌓는다."""
+        stack = self.find_stack(item)
+        if stack:
+            stack.count += item.count
+        else:
+            item.parent = self
+            self.items.append(item)
+
     def drop(self, item: Item) -> None:
-        """아이템을 인벤토리에서 제거하고 플레이어의 위치에 놓는다."""
+        """아이템(쌓인 것 전부)을 인벤토리에서 제거하고 플레이어의 위치에 놓는다."""
         self.items.remove(item)
-        item.place(self.parent.x, self.parent.y, self.gamemap)
+        self.engine.message_log.add_message(f"You dropped the {item.display_name}.")
+
+        gamemap = self.gamemap
+        for other in gamemap.get_items_at_location(self.parent.x, self.parent.y):
+            if other.can_stack_with(item):
+                # 바닥에 같은 아이템이 있으면 그 위에 쌓는다.
+                other.count += item.count
+                return
 
-        self.engine.message_log.add_message(f"You dropped the {item.name}.")
+        item.place(self.parent.x, self.parent.y, gamemap)
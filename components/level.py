@@ -8,6 +8,8 @@ if TYPE_CHECKING:
     from entity import Actor
 
 class Level(BaseComponent):
+    __slots__ = ("current_level", "current_xp", "level_up_base", "level_up_factor", "xp_given")
+
     parent:Actor
     
     def __init__(self, current_level:int = 1, currnet_xp:int = 0, level_up_base:int = 0, level_up_factor:int = 150, xp_given:int = 0):
@@ -51,6 +53,7 @@ class Level(BaseComponent):
     
     def increase_power(self, amount:int = 1) -> None:
         self.parent.fighter.base_power += amount
+        self.parent.sync_columns()
         
         self.engine.message_log.add_message("You feel stronger!")
 
@@ -58,6 +61,7 @@ class Level(BaseComponent):
 
     def increase_defense(self, amount:int = 1) -> None:
         self.parent.fighter.base_defense += amount
+        self.parent.sync_columns()
         
         self.engine.message_log.add_message("Your movements are getting swifter!")
 
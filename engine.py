@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import lzma
 import pickle
-from typing import TYPE_CHECKING
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 
+import numpy as np
 from tcod.console import Console
-from tcod.map import compute_fov
+from tcod.constants import FOV_SYMMETRIC_SHADOWCAST
 
+import color
+from entity import Actor
 import exceptions
 from message_log import MessageLog
 import render_functions
+from status_effects import get_forced_action
+from visibility import VisibilityIndex
 
 if TYPE_CHECKING:
-    from entity import Actor
     from game_map import GameMap, GameWorld
 
+# 플레이어의 시야 반지름
+FOV_RADIUS = 8
+
 
 class Engine:
     game_map: GameMap
@@ -23,22 +32,218 @@ class Engine:
     def __init__(self, player: Actor):
         self.message_log = MessageLog()
         self.mouse_location = (0, 0)
+        # 화면에 보이는 상태가 바뀔 수 있을 때마다 증가, main 루프는 이 값이 그대로면 다시 그리지 않는다.
+        self.render_version = 0
         self.player = player
+        # 지금까지의 플레이어 턴 수, 상태 효과의 시계
+        self.turn = 0
+
+        # 마지막으로 시야를 계산한 (맵, 플레이어 위치, 반지름, 투명도 버전), 같으면 다시 계산하지 않는다.
+        self._fov_key: Optional[tuple] = None
+        self._fov_window: Optional[Tuple[slice, slice]] = None  # 마지막으로 시야를 계산한 창
+        # 시야 안의 엔티티와 이번 턴에 시야에 들어오거나 나간 엔티티
+        self.visibility = VisibilityIndex()
+        self.fov_cache_hits = 0
+        self.fov_cache_misses = 0
+
+        # True면 추격하는 적들이 플레이어를 뿌리로 하는 거리 지도 하나를 공유한다.
+        self.use_player_distance_map = True
+        self._player_distance_map: Optional[np.ndarray] = None
+        self._player_distance_map_key: Optional[tuple] = None
+        self._player_distance_map_checked = False
+        # 플레이어에게서 시선이 트인 타일, 원거리 공격하는 적들이 공유한다.
+        self._player_sight_map: Optional[np.ndarray] = None
+        self._player_sight_map_key: Optional[tuple] = None
+        # True면 플레이어가 맵에 냄새를 남기고, 플레이어를 놓친 적들이 그 냄새를 따라간다.
+        self.use_scent_map = True
+
+        # 0보다 크면 적의 행동을 이 수만큼의 스레드에서 나눠서 결정하고, 순서대로 적용한다.
+        self.ai_workers = 0
+        self._ai_pool: Optional[ThreadPoolExecutor] = None
+
+    def __getstate__(self) -> dict:
+        """저장할 때 다시 계산할 수 있는 캐시와 스레드 풀은 뺀다."""
+        state = self.__dict__.copy()
+        state["_player_distance_map"] = None
+        state["_player_distance_map_key"] = None
+        state["_player_distance_map_checked"] = False
+        state["_player_sight_map"] = None
+        state["_player_sight_map_key"] = None
+        state["_fov_key"] = None
+        state["_fov_window"] = None
+        state["visibility"] = VisibilityIndex()
+        state["_ai_pool"] = None
+        return state
+
+    def get_player_distance_map(self) -> np.ndarray:
+        """
+        플레이어까지의 거리 지도를 리턴.
+
+        적 턴마다 처음 요청될 때 한번만 확인하고, 맵, 플레이어 위치, 막힌 타일 중
+        무언가 바뀌었을 때만 다시 계산한다.
+        """
+        if not self._player_distance_map_checked:
+            self._player_distance_map_checked = True
+            key = (self.game_map, self.player.x, self.player.y, self.game_map.occupancy_version)
+            if key != self._player_distance_map_key:
+                self._player_distance_map = self.game_map.compute_distance_map(self.player.x, self.player.y)
+                self._player_distance_map_key = key
+        return self._player_distance_map
+
+    def get_player_sight_map(self) -> np.ndarray:
+        """
+        플레이어와 시선이 트인 타일이 True인 배열을 리턴, 반지름은 FOV_RADIUS.
+
+        적마다 플레이어까지 선을 긋는 대신 플레이어에게서 대칭 shadowcast를 한번 해서 모든 적이 같이 쓴다.
+        대칭이므로 적에게서 플레이어가 보이는 것과 플레이어에게서 적이 보이는 것이 같다.
+        맵, 플레이어 위치, 타일 중 무언가 바뀌었을 때만 다시 계산한다.
+        """
+        key = (self.game_map, self.player.x, self.player.y, self.game_map.transparency_version)
+        if key != self._player_sight_map_key:
+            window, sight = self.game_map.compute_fov(
+                self.player.x, self.player.y, FOV_RADIUS, algorithm=FOV_SYMMETRIC_SHADOWCAST)
+            self._player_sight_map = np.zeros(self.game_map.tiles.shape, dtype=bool, order="F")
+            self._player_sight_map[window] = sight
+            self._player_sight_map_key = key
+        return self._player_sight_map
+
+    def get_actors_in_line_of_sight(self, actors: Iterable[Actor]) -> List[Actor]:
+        """`actors` 중 플레이어와 시선이 트인 Actor만 한번에 골라서 리턴"""
+        actors = list(actors)
+        if not actors:
+            return []
+        xs = np.fromiter((actor.x for actor in actors), dtype=np.intp, count=len(actors))
+        ys = np.fromiter((actor.y for actor in actors), dtype=np.intp, count=len(actors))
+        in_sight = self.get_player_sight_map()[xs, ys]
+        return [actor for actor, seen in zip(actors, in_sight) if seen]
 
     def handle_enemy_turns(self) -> None:
-        for entity in set(self.game_map.actors) - {self.player}:
+        self._player_distance_map_checked = False
+        self.turn += 1
+        # 이번 턴에 tick하거나 풀리는 상태 효과만 처리한다.
+        self.game_map.status_effects.advance(self.turn)
+        if self.use_scent_map:
+            self.game_map.update_scent(self.player.x, self.player.y)
+        # 멀리서 할 일 없는 적은 잠들어 턴을 쓰지 않는다. 시야 안의 적은 시야를 갱신할 때 만든 인덱스에서 찾는다.
+        # 방금 새 맵에 들어왔으면 visible이 아직 비어있으므로 시야부터 계산한다, 이때는 발견 메세지를 내지 않는다.
+        if self.visibility.game_map is not self.game_map:
+            self.update_fov()
+        self.game_map.update_activity(self.player.x, self.player.y, self.visibility.entities)
+
+        # 플레이어의 다음 차례를 예약하고, 그 전에 차례가 오는 적들이 순서대로 행동한다.
+        scheduler = self.game_map.scheduler
+        if self.player in scheduler:
+            scheduler.schedule(self.player)
+        turn_order = scheduler.pop_before(self.player)
+        if self.ai_workers > 0:
+            self._handle_enemy_turns_in_parallel(turn_order)
+            return
+
+        for entity in turn_order:
             if entity.ai:
                 try:
-                    entity.ai.perform()
+                    self._perform_ai(entity)
+                except exceptions.Impossible:
+                    pass  # AI의 불가능한 행동 예외는 무시.
+
+    @staticmethod
+    def _perform_ai(entity: Actor) -> None:
+        """상태 효과(혼란 등)가 AI를 대신하면 그 행동을, 아니면 AI의 행동을 수행"""
+        if entity.status_effects:
+            action = get_forced_action(entity)
+            if action is not None:
+                return action.perform()
+        entity.ai.perform()
+
+    def _handle_enemy_turns_in_parallel(self, turn_order: Iterable[Actor]) -> None:
+        """
+        적의 행동을 결정 단계와 적용 단계로 나눠서 처리.
+
+        차례 순서를 라운드로 나누고(빠른 적은 여러 라운드에 나온다),
+        라운드마다 모든 적의 BaseAI.decide를 스레드 풀에서 동시에 부른 다음, 차례 순서대로 행동을 적용한다.
+        경로 계산 같은 tcod/NumPy 호출은 GIL을 풀어서 여러 코어를 쓸 수 있다.
+        앞선 적의 이동 때문에 행동이 불가능해지면 그 적은 지금 상태로 다시 결정한다.
+        상태 효과가 걸린 적은 무작위 행동이 섞일 수 있어서 결정도 차례가 왔을 때 한다.
+        """
+        # 결정 단계에서는 공유 캐시를 읽기만 하도록 미리 만들어 둔다.
+        self.game_map.get_path_graph()
+        if self.use_player_distance_map:
+            self.get_player_distance_map()
+        self.get_player_sight_map()
+
+        rounds: List[List[Actor]] = []
+        turns_taken: Dict[Actor, int] = {}
+        for entity in turn_order:
+            turn = turns_taken.get(entity, 0)
+            turns_taken[entity] = turn + 1
+            if turn == len(rounds):
+                rounds.append([])
+            rounds[turn].append(entity)
+
+        if self._ai_pool is None:
+            self._ai_pool = ThreadPoolExecutor(max_workers=self.ai_workers)
+
+        for actors in rounds:
+            decisions = list(self._ai_pool.map(
+                lambda entity: entity.ai.decide() if entity.ai and not entity.status_effects else None, actors))
+            for entity, action in zip(actors, decisions):
+                if not entity.ai:
+                    continue  # 앞선 행동으로 죽음
+                try:
+                    if action is None:
+                        self._perform_ai(entity)
+                        continue
+                    try:
+                        action.perform()
+                    except exceptions.Impossible:
+                        entity.ai.perform()
                 except exceptions.Impossible:
                     pass  # AI의 불가능한 행동 예외는 무시.
 
     def update_fov(self) -> None:
-        """시야 범위를 플레이어의 시야에 맞게 업데이트"""
-        self.game_map.visible[:] = compute_fov(
-            self.game_map.tiles["transparent"], (self.player.x, self.player.y), radius=8,)
+        """
+        시야 범위를 플레이어의 시야에 맞게 업데이트
+
+        기다리기나 아이템 사용처럼 플레이어 위치와 타일이 그대로인 턴에는 지난 결과를 그대로 쓴다.
+        시야는 플레이어 주위의 창에서만 계산하고, 지난 창과 이번 창만 visible과 explored에 쓴다.
+        """
+        key = (self.game_map, self.player.x, self.player.y, FOV_RADIUS, self.game_map.transparency_version)
+        if key == self._fov_key:
+            self.fov_cache_hits += 1
+            # 시야는 그대로여도 엔티티는 움직였을 수 있다.
+            self.update_visibility()
+            return
+        # 같은 맵에서 지난 창이 있으면 그 창만 지우고, 아니면(새 맵, 불러온 게임) 전체를 지운다.
+        same_map = self._fov_key is not None and self._fov_key[0] is self.game_map
+        self._fov_key = key
+        self.fov_cache_misses += 1
+
+        game_map = self.game_map
+        if same_map and self._fov_window is not None:
+            game_map.visible[self._fov_window] = False
+        else:
+            game_map.visible[:] = False
+
+        window, fov = game_map.compute_fov(self.player.x, self.player.y, FOV_RADIUS)
+        game_map.visible[window] = fov
         # 만약 타일이 "visible"이면 "explored"도 추가
-        self.game_map.explored |= self.game_map.visible
+        game_map.explored[window] |= fov
+        self._fov_window = window
+        self.update_visibility()
+
+    def update_visibility(self) -> None:
+        """
+        visible 배열에서 시야 안의 엔티티를 한번에 골라 인덱스를 다시 만들고, 새로 시야에 들어온 적을 알림.
+
+        새 맵에 들어가거나 게임을 불러온 직후에는 알리지 않는다.
+        """
+        same_map = self.visibility.game_map is self.game_map
+        self.visibility.update(self.game_map, self.game_map.get_entities_in_mask(self.game_map.visible))
+        if not same_map:
+            return
+        for entity in self.visibility.entered:
+            if isinstance(entity, Actor) and entity.is_alive and entity is not self.player:
+                self.message_log.add_message(f"{entity.name} comes into view.", color.enemy_sighted)
 
     def render(self, console: Console):
         self.game_map.render(console)
@@ -55,6 +260,28 @@ class Engine:
         render_functions.render_dungeon_level(
             console=console, dungeon_level=self.game_world.current_floor, location=(0,47))
 
+    def fork(self) -> Engine:
+        """
+        탐색이나 시뮬레이션을 위한 가벼운 분기 복제본을 리턴.
+
+        타일 배열처럼 바뀌지 않는 데이터는 공유하고, 엔티티와 컴포넌트 상태만 복제한다.
+        원본과 복제본은 서로에게 영향을 주지 않는다.
+        """
+        fork = Engine(player=self.player)
+        fork.turn = self.turn
+        fork.mouse_location = self.mouse_location
+        fork.use_player_distance_map = self.use_player_distance_map
+        fork.ai_workers = self.ai_workers
+        fork.use_scent_map = self.use_scent_map
+        fork.message_log = self.message_log.fork()
+
+        fork.game_world = copy.copy(self.game_world)
+        fork.game_world.engine = fork
+
+        # 복제된 플레이어는 GameMap.fork에서 fork.player로 설정된다.
+        fork.game_map = self.game_map.fork(fork)
+        return fork
+
     def save_as(self, filename: str) -> None:
         """엔진 instanece를 압축 파일로 저장"""
         save_data = lzma.compress(pickle.dumps(self))
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import copy
 import math
-from typing import Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
 
+from prototype import shallow_clone, slot_names
 from render_order import RenderOrder
+from turn_scheduler import NORMAL_SPEED
 
 if TYPE_CHECKING:
     from components.ai import BaseAI
@@ -15,6 +16,7 @@ if TYPE_CHECKING:
     from components.inventory import Inventory
     from components.level import Level
     from game_map import GameMap
+    from status_effects import StatusEffect
 
 T = TypeVar("T", bound="Entity")  # 나중에 문법 검색해보기
 
@@ -24,6 +26,8 @@ class Entity:
     일반적인 오브젝트(플레이어, 적, 아이템 등등)
     """
 
+    __slots__ = ("parent", "x", "y", "char", "color", "name", "blocks_movement", "render_order")
+
     parent: Union[GameMap, Inventory]
 
     def __init__(
@@ -41,46 +45,71 @@ class Entity:
         if parent:
             # 만약 parent가 없다면 나중에 초기화함.
             self.parent = parent
-            parent.entities.add(self)
+            parent.add_entity(self)
 
     @property
     def gamemap(self) -> GameMap:
         return self.parent.gamemap
 
+    def clone(self: T) -> T:
+        """parent가 없는 복제본을 리턴. 하위 클래스는 컴포넌트도 복제한다."""
+        return shallow_clone(self)
+
     def spawn(self: T, gamemap: GameMap, x: int, y: int) -> T:
         """주어진 위치에 인스턴스의 복제를 배치"""
-        clone = copy.deepcopy(self)
+        clone = self.clone()
         clone.x = x
         clone.y = y
         clone.parent = gamemap
-        gamemap.entities.add(clone)
+        gamemap.add_entity(clone)
         return clone
 
+    def spawn_many(self: T, gamemap: GameMap, locations: Iterable[Tuple[int, int]]) -> List[T]:
+        """주어진 위치들에 인스턴스의 복제를 한번에 배치"""
+        return [self.spawn(gamemap, x, y) for x, y in locations]
+
     def place(self, x: int, y: int, gamemap: Optional[GameMap] = None) -> None:
         """엔티티를 새로운 장소에 배치, GameMaps에서 움직임.(Handles moving across GameMaps?)"""
-        self.x = x
-        self.y = y
+        old_x, old_y = self.x, self.y
+        on_map = hasattr(self, "parent") and self.parent is self.gamemap
         if gamemap:
-            if hasattr(self, "parent"):
-                if self.parent is self.gamemap:
-                    self.parent.entities.remove(self)
+            if on_map:
+                self.parent.remove_entity(self)
+            self.x = x
+            self.y = y
             self.parent = gamemap
-            gamemap.entities.add(self)
+            gamemap.add_entity(self)
+        else:
+            self.x = x
+            self.y = y
+            if on_map:
+                self.parent.relocate_entity(self, old_x, old_y)
 
     def distance(self, x: int, y: int) -> float:
         """현재 엔티티와 주어진 좌표간의 거리를 리턴."""
         return math.sqrt((x - self.x)**2 + (y - self.y)**2)
 
+    def sync_columns(self) -> None:
+        """엔티티가 열 저장소를 쓰는 맵 위에 있다면, 저장소에 현재 상태를 반영"""
+        columns = getattr(getattr(self, "parent", None), "columns", None)
+        if columns is not None:
+            columns.update(self)
+
     def move(self, dx=int, dy=int) -> None:
         # 엔티티를 주어진 양만큼 움직임
+        old_x, old_y = self.x, self.y
         self.x += dx
         self.y += dy
+        self.gamemap.relocate_entity(self, old_x, old_y)
 
 
 class Actor(Entity):
+    __slots__ = ("ai", "equipment", "fighter", "inventory", "level", "speed", "status_effects")
+
     def __init__(
         self, *, x: int = 0, y: int = 0, char: str = "?", color: Tuple[int, int, int] = (255, 255, 255),
         name: str = "<Unnamed>", ai_cls: Type[BaseAI], equipment: Equipment, fighter: Fighter, inventory: Inventory, level: Level,
+        speed: int = NORMAL_SPEED,
     ):
         super().__init__(x=x, y=y, char=char, color=color, name=name,
                          blocks_movement=True, render_order=RenderOrder.ACTOR)
@@ -99,20 +128,50 @@ class Actor(Entity):
         self.level = level
         self.level.parent = self
 
+        self.speed = speed  # 높을수록 자주 행동한다. NORMAL_SPEED의 두배면 보통 Actor보다 두번 더 자주 행동
+
+        # 걸려있는 상태 효과, 이름마다 하나. 예약은 맵의 StatusEffectWheel이 한다.
+        self.status_effects: Dict[str, StatusEffect] = {}
+
     @property
     def is_alive(self) -> bool:
         """행동을 취할 수 있는 한 True를 리턴"""
         return bool(self.ai)
 
+    def clone(self) -> Actor:
+        clone = super().clone()
+        clone.ai = self.ai.clone(clone) if self.ai else None
+        clone.status_effects = {name: effect.clone() for name, effect in self.status_effects.items()}
+
+        for name in ("equipment", "fighter", "inventory", "level"):
+            component = getattr(self, name).clone()
+            component.parent = clone
+            setattr(clone, name, component)
+
+        # 장착한 아이템은 복제된 인벤토리 속 아이템을 가리키도록 한다.
+        for slot in ("weapon", "armor"):
+            item = getattr(self.equipment, slot)
+            if item is None:
+                continue
+            if item in self.inventory.items:
+                setattr(clone.equipment, slot, clone.inventory.items[self.inventory.items.index(item)])
+            else:
+                setattr(clone.equipment, slot, item.clone())
+
+        return clone
+
 
 class Item(Entity):
+    __slots__ = ("ai_cls", "consumable", "equippable", "count")
+
     def __init__(self, *, x: int = 0, y: int = 0, char: str = "?", 
         color: Tuple[int, int, int] = (255, 255, 255), name: str = "<Unnamed>", 
-        consumable: Optional[Consumable] = None, equippable: Optional[Consumable] = None,):
+        consumable: Optional[Consumable] = None, equippable: Optional[Consumable] = None, count: int = 1,):
         super().__init__(x=x, y=y, char=char, color=color, name=name,
                          blocks_movement=False, render_order=RenderOrder.ITEM,)
 
         self.ai_cls = None
+        self.count = count  # 이 엔티티 하나로 쌓여있는 아이템의 수
         self.consumable = consumable
 
         if self.consumable:
@@ -122,3 +181,33 @@ class Item(Entity):
 
         if self.equippable:
             self.equippable.parent = self
+
+    def clone(self) -> Item:
+        clone = super().clone()
+        for name in ("consumable", "equippable"):
+            component = getattr(self, name)
+            if component is not None:
+                component = component.clone()
+                component.parent = clone
+                setattr(clone, name, component)
+        return clone
+
+    @property
+    def display_name(self) -> str:
+        """쌓여있다면 개수를 붙인 이름을 리턴"""
+        if self.count > 1:
+            return f"{self.name} (x{self.count})"
+        return self.name
+
+    def can_stack_with(self, other: Item) -> bool:
+        """같은 소모품이면 True를 리턴, 장비는 쌓이지 않는다."""
+        if self.consumable is None or other.consumable is None or self.equippable or other.equippable:
+            return False
+        if (self.name, self.char, self.color) != (other.name, other.char, other.color):
+            return False
+        if type(self.consumable) is not type(other.consumable):
+            return False
+        return all(
+            getattr(self.consumable, name) == getattr(other.consumable, name)
+            for name in slot_names(type(self.consumable))
+        )
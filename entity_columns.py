@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from entity import Entity
+
+
+class EntityColumns:
+    """
+    GameMap 위 엔티티의 위치, 전투 수치, 그리기 정보를 NumPy 배열(열)로 보관하는 저장소.
+
+    엔티티 객체가 원본이고, 이 저장소는 변경이 있을 때마다 갱신되는 사본이다.
+    덕분에 거리 계산, 범위 피해, 그리기 컬링을 벡터 연산으로 처리할 수 있다.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.defense = np.zeros(capacity, dtype=np.int32)
+        self.power = np.zeros(capacity, dtype=np.int32)
+        self.render_order = np.zeros(capacity, dtype=np.int8)
+        self.blocks_movement = np.zeros(capacity, dtype=bool)
+        self.is_alive = np.zeros(capacity, dtype=bool)  # 살아있는 Actor
+        self.in_use = np.zeros(capacity, dtype=bool)
+
+        self.entities: List[Optional[Entity]] = [None] * capacity
+        self.rows: Dict[Entity, int] = {}
+        self.free_rows: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity in self.rows
+
+    def _grow(self) -> None:
+        """저장소의 크기를 두 배로 늘림"""
+        old_capacity = self.capacity
+        self.capacity *= 2
+
+        for name in ("x", "y", "hp", "defense", "power", "render_order", "blocks_movement", "is_alive", "in_use"):
+            old_column = getattr(self, name)
+            new_column = np.zeros(self.capacity, dtype=old_column.dtype)
+            new_column[:old_capacity] = old_column
+            setattr(self, name, new_column)
+
+        self.entities.extend([None] * old_capacity)
+        self.free_rows.extend(range(self.capacity - 1, old_capacity - 1, -1))
+
+    def add(self, entity: Entity) -> None:
+        """엔티티에 행을 할당하고 현재 상태를 기록"""
+        if not self.free_rows:
+            self._grow()
+
+        row = self.free_rows.pop()
+        self.rows[entity] = row
+        self.entities[row] = entity
+        self.in_use[row] = True
+        self.update(entity)
+
+    def remove(self, entity: Entity) -> None:
+        """엔티티의 행을 비움"""
+        row = self.rows.pop(entity)
+        self.entities[row] = None
+        self.in_use[row] = False
+        self.blocks_movement[row] = False
+        self.is_alive[row] = False
+        self.free_rows.append(row)
+
+    def update_position(self, entity: Entity) -> None:
+        row = self.rows[entity]
+        self.x[row] = entity.x
+        self.y[row] = entity.y
+
+    def update(self, entity: Entity) -> None:
+        """엔티티의 모든 열을 현재 상태로 갱신, 저장소에 없는 엔티티는 무시"""
+        row = self.rows.get(entity)
+        if row is None:
+            return
+
+        self.x[row] = entity.x
+        self.y[row] = entity.y
+        self.render_order[row] = entity.render_order.value
+        self.blocks_movement[row] = entity.blocks_movement
+
+        fighter = getattr(entity, "fighter", None)
+        if fighter is not None:
+            self.hp[row] = fighter.hp
+            self.defense[row] = fighter.defense
+            self.power[row] = fighter.power
+            self.is_alive[row] = entity.is_alive
+        else:
+            self.hp[row] = self.defense[row] = self.power[row] = 0
+            self.is_alive[row] = False
+
+    def distances_squared(self, x: int, y: int) -> np.ndarray:
+        """모든 행과 주어진 좌표간의 거리의 제곱을 리턴"""
+        dx = self.x - x
+        dy = self.y - y
+        return dx * dx + dy * dy
+
+    def actors_within_radius(self, x: int, y: int, radius: float) -> List[Entity]:
+        """주어진 좌표에서 radius 이내(유클리드 거리)의 살아있는 Actor를 리턴"""
+        mask = self.is_alive & (self.distances_squared(x, y) <= radius * radius)
+        return [self.entities[row] for row in np.flatnonzero(mask)]
+
+    def nearest_actor(
+        self, x: int, y: int, max_distance: float, visible: Optional[np.ndarray] = None, exclude: Optional[Entity] = None,
+    ) -> Optional[Entity]:
+        """
+        거리가 max_distance 미만인 살아있는 Actor 중 가장 가까운 것을 리턴.
+        `visible`이 주어지면 그 배열에서 True인 타일 위의 Actor만 고른다.
+        """
+        distances_squared = self.distances_squared(x, y)
+        mask = self.is_alive & (distances_squared < max_distance * max_distance)
+        if exclude is not None and exclude in self.rows:
+            mask[self.rows[exclude]] = False
+
+        rows = np.flatnonzero(mask)
+        if visible is not None:
+            rows = rows[visible[self.x[rows], self.y[rows]]]
+        if not rows.size:
+            return None
+        return self.entities[rows[np.argmin(distances_squared[rows])]]
+
+    def actors_in_mask(self, mask: np.ndarray) -> List[Entity]:
+        """`mask` 배열에서 True인 타일 위의 살아있는 Actor를 리턴"""
+        rows = np.flatnonzero(self.is_alive)
+        rows = rows[mask[self.x[rows], self.y[rows]]]
+        return [self.entities[row] for row in rows]
+
+    def entities_in_mask(self, mask: np.ndarray) -> List[Entity]:
+        """`mask` 배열에서 True인 타일 위의 엔티티를 리턴"""
+        rows = np.flatnonzero(self.in_use)
+        rows = rows[mask[self.x[rows], self.y[rows]]]
+        return [self.entities[row] for row in rows]
+
+    def visible_in_render_order(self, visible: np.ndarray) -> List[Entity]:
+        """`visible` 타일 위에 있는 엔티티를 그리는 순서대로 리턴"""
+        rows = np.flatnonzero(self.in_use)
+        rows = rows[visible[self.x[rows], self.y[rows]]]
+        rows = rows[np.argsort(self.render_order[rows], kind="stable")]
+        return [self.entities[row] for row in rows]
@@ -1,4 +1,4 @@
-from components.ai import HostileEnemy
+from components.ai import HostileEnemy, RangedEnemy
 from components import consumable, equippable
 from components.equipment import Equipment
 from components.fighter import Fighter
@@ -13,6 +13,8 @@ orc = Actor(char="o", color=(63, 127, 63), name="Orc", ai_cls=HostileEnemy, equi
             fighter=Fighter(hp=10, base_defense=0, base_power=3), inventory=Inventory(capacity=0),level=Level(xp_given=35),)
 troll = Actor(char="T", color=(0, 127, 0), name="Troll", ai_cls=HostileEnemy, equipment=Equipment(),
               fighter=Fighter(hp=16, base_defense=1, base_power=4), inventory=Inventory(capacity=0),level=Level(xp_given=100),)
+archer = Actor(char="a", color=(127, 127, 0), name="Goblin Archer", ai_cls=RangedEnemy, equipment=Equipment(),
+               fighter=Fighter(hp=6, base_defense=0, base_power=2), inventory=Inventory(capacity=0),level=Level(xp_given=50),)
 
 health_potion = Item(char="!", color=(127, 0, 255), name="Health Potion",
                      consumable=consumable.HealingConsumable(amount=4),)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+from tcod.constants import FOV_RESTRICTIVE
+from tcod.map import compute_fov
+
+# (창, 창 크기의 시야 배열)
+FovWindow = Tuple[Tuple[slice, slice], np.ndarray]
+
+
+def compute_fov_window(
+    transparency: np.ndarray, x: int, y: int, radius: int, algorithm: int = FOV_RESTRICTIVE,
+) -> FovWindow:
+    """
+    (x, y)를 중심으로 반지름 radius인 사각형 창에서만 시야를 계산하고 (창, 창 크기의 시야 배열)을 리턴.
+
+    반지름 밖의 타일은 보일 수 없으므로 결과는 맵 전체에서 계산한 것과 같고, 비용은 맵 크기와 상관없다.
+    """
+    width, height = transparency.shape
+    left, top = max(0, x - radius), max(0, y - radius)
+    window = slice(left, min(width, x + radius + 1)), slice(top, min(height, y + radius + 1))
+    fov = compute_fov(transparency[window], (x - left, y - top), radius=radius, algorithm=algorithm)
+    return window, fov
+
+
+class FovCache:
+    """
+    시점마다 계산한 시야 창을 비트로 압축해서 최근에 쓴 순서로 max_entries개까지 보관하는 LRU 캐시.
+
+    반지름 8의 창은 압축하면 37바이트이므로 수천개를 보관해도 메모리는 작다.
+    키에 맵의 투명도 버전을 넣으면 타일이 바뀐 뒤의 항목은 다시 쓰이지 않고 밀려난다.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # 키마다 (창, 창의 모양, np.packbits로 압축한 시야)
+        self._entries: OrderedDict[Hashable, Tuple[Tuple[slice, slice], Tuple[int, int], np.ndarray]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        """저장할 때 다시 계산할 수 있는 항목은 뺀다."""
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        return state
+
+    @property
+    def nbytes(self) -> int:
+        """압축된 시야 배열이 차지하는 바이트 수"""
+        return sum(packed.nbytes for _, _, packed in self._entries.values())
+
+    def get(self, key: Hashable) -> Optional[FovWindow]:
+        """key의 시야를 풀어서 리턴, 없으면 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        window, shape, packed = entry
+        fov = np.unpackbits(packed, count=shape[0] * shape[1]).reshape(shape).view(bool)
+        return window, fov
+
+    def put(self, key: Hashable, window: Tuple[slice, slice], fov: np.ndarray) -> None:
+        self._entries[key] = window, fov.shape, np.packbits(fov, axis=None)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
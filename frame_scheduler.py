@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, Hashable, Optional
+
+
+class FrameScheduler:
+    """
+    main 루프에서 언제 화면을 다시 그릴지 정함.
+
+    그림을 정하는 상태의 키(핸들러와 그 render_version)가 바뀌었을 때만 그리고,
+    max_fps가 있으면 프레임 사이의 간격을 지켜서 그 사이에 온 이벤트는 모아서 한번에 그린다.
+    바뀐 것이 없으면 다음 이벤트가 올 때까지 기다리므로 가만히 있는 동안에는 CPU를 거의 쓰지 않는다.
+    """
+
+    def __init__(self, max_fps: Optional[float] = None, clock: Callable[[], float] = time.perf_counter):
+        self.frame_time = 1.0 / max_fps if max_fps else 0.0  # 프레임 사이의 최소 간격(초)
+        self.clock = clock
+        self._rendered_key: Optional[Hashable] = None
+        self._forced = True  # 키와 상관없이 다음 프레임을 그림, 창이 다시 보이거나 크기가 바뀔 때
+        self._last_frame_time = -math.inf
+
+        self.frames_rendered = 0
+        self.frames_skipped = 0  # 바뀐 것이 없어서 그리지 않은 횟수
+
+    def invalidate(self) -> None:
+        """키가 그대로여도 다음 프레임을 그리게 함"""
+        self._forced = True
+
+    def is_dirty(self, key: Hashable) -> bool:
+        return self._forced or key != self._rendered_key
+
+    def should_render(self, key: Hashable) -> bool:
+        """지금 그려야 하면 True를 리턴, 바뀌었지만 FPS 제한에 걸리면 다음 프레임으로 미룬다."""
+        if not self.is_dirty(key):
+            self.frames_skipped += 1
+            return False
+        return self.clock() - self._last_frame_time >= self.frame_time
+
+    def rendered(self, key: Hashable) -> None:
+        """key의 상태를 그린 후 호출"""
+        self._rendered_key = key
+        self._forced = False
+        self._last_frame_time = self.clock()
+        self.frames_rendered += 1
+
+    def timeout(self, key: Hashable) -> Optional[float]:
+        """
+        이벤트를 기다릴 최대 시간(초)을 리턴.
+
+        그릴 것이 미뤄져 있으면 다음 프레임까지, 아니면 None(다음 이벤트가 올 때까지)
+        """
+        if not self.is_dirty(key):
+            return None
+        return max(0.0, self._last_frame_time + self.frame_time - self.clock())
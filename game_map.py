@@ -1,60 +1,546 @@
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
 
 import numpy as np
+import tcod
 from tcod.console import Console
+from tcod.constants import FOV_RESTRICTIVE
 
 from entity import Actor, Item
+from entity_columns import EntityColumns
+from fov import FovCache, FovWindow, compute_fov_window
+from room_graph import RoomGraph, chebyshev_cost, path_cost
+from status_effects import StatusEffectWheel
 import tile_types
+from turn_scheduler import TurnScheduler
 
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
 
+# 이동을 막는 엔티티가 있는 타일에 더하는 경로 cost
+BLOCKER_PATH_COST = 10
+# 시작과 목표가 이 거리(chebyshev) 이상 떨어져 있으면 방 그래프로 경로를 찾는다.
+ROOM_PATH_MIN_DISTANCE = 20
+# 방 그래프의 경로 cost가 직선(chebyshev) cost의 이 배수보다 크면 돌아가는 길로 보고 맵 전체에서 다시 찾는다.
+ROOM_PATH_MAX_DETOUR = 1.3
+# 냄새 지도: 플레이어가 선 타일의 냄새, 턴마다 남는 비율, 이웃으로 퍼질 때 남는 비율, 이보다 약하면 0
+SCENT_STRENGTH = 100.0
+SCENT_DECAY = 0.9
+SCENT_SPREAD = 0.8
+SCENT_MIN = 1.0
+# 잠든 Actor를 묶어두는 깨우기 인덱스의 칸 크기(타일)
+WAKE_CHUNK_SIZE = 8
+
 
 class GameMap:
-    def __init__(self, engine: Engine, width: int, height: int, entities: Iterable[Entity] = ()):
+    def __init__(
+        self, engine: Engine, width: int, height: int, entities: Iterable[Entity] = (), columnar_entities: bool = False,
+        compact_corpses: bool = False, activity_radius: Optional[int] = None, fov_cache_size: Optional[int] = None,
+    ):
         self.engine = engine
         self.width, self.height = width, height
-        self.entities = set(entities)
+        self.entities = set()
+        # 선택적인 열 기반 저장소, 벡터화된 거리 계산과 그리기 컬링에 쓰인다.
+        self.columns: Optional[EntityColumns] = EntityColumns() if columnar_entities else None
+        # 타일 좌표를 키로 하는 엔티티 인덱스, 위치 기반 조회를 상수 시간으로 한다.
+        self.entity_index: Dict[Tuple[int, int], List[Entity]] = {}
+        # 종류별 엔티티 목록, 추가/제거/사망 때 갱신되어 전체 엔티티를 훑지 않게 한다.
+        self._live_actors: Set[Actor] = set()
+        self._corpses: Set[Actor] = set()
+        self._items: Set[Item] = set()
+
+        # 플레이어에게서 이 거리(chebyshev)보다 멀고 할 일이 없는 Actor는 잠든다. None이면 모두 깨어있다.
+        self.activity_radius = activity_radius
+        # 매 턴 행동하는 Actor와, 칸 좌표를 키로 잠든 Actor를 묶어두는 깨우기 인덱스
+        self._awake_actors: Set[Actor] = set()
+        self._dormant_index: Dict[Tuple[int, int], Set[Actor]] = {}
+        self._dormant_chunks: Dict[Actor, Tuple[int, int]] = {}
+        # 깨어있는 Actor의 행동 순서, 잠든 Actor는 예약되지 않는다.
+        self.scheduler = TurnScheduler()
+        # Actor에 걸린 상태 효과의 tick과 만료 예약, 시계는 Engine.turn을 따른다.
+        self.status_effects = StatusEffectWheel(engine.turn if engine is not None else 0)
+
+        # 타일마다 이동을 막는 엔티티의 수, 이동과 경로 계산에서 배열로 읽는다.
+        self.occupancy = np.zeros((width, height), dtype=np.int16, order="F")
+        self.occupancy_version = 0  # occupancy가 바뀔 때마다 증가
+        self._blockers: Set[Entity] = set()
+
+        # 경로 계산용 cost 배열과 그래프, 처음 쓰일 때 만들고 타일이 바뀌면 버린다.
+        # 그 사이에는 점유 배열이 바뀔 때마다 막힌 타일의 cost만 고친다.
+        self._path_cost: Optional[np.ndarray] = None
+        self._path_graph: Optional[tcod.path.SimpleGraph] = None
+        # procgen이 만든 방과 터널의 그래프, 먼 거리의 경로를 싸게 찾는다. 없으면 항상 맵 전체에서 찾는다.
+        self.room_graph: Optional[RoomGraph] = None
+
+        for entity in entities:
+            self.add_entity(entity)
+
         self.tiles = np.full(
             (width, height), fill_value=tile_types.wall, order="F")
+        self.transparency_version = 0  # tiles_changed가 불릴 때마다 증가, 시야 캐시의 키로 쓰인다.
+        # 시점마다 계산한 시야를 보관하는 캐시, None이면 매번 계산한다.
+        self.fov_cache: Optional[FovCache] = FovCache(fov_cache_size) if fov_cache_size else None
+
+        # True면 죽은 Actor를 엔티티 대신 타일마다의 데칼(그림과 이름)로 남긴다.
+        self.compact_corpses = compact_corpses
+        self.decals = np.zeros((width, height), dtype=tile_types.graphic_dt, order="F")  # ch가 0이면 데칼 없음
+        self.decal_names: Dict[Tuple[int, int], List[str]] = {}
 
         # 플레이어가 현재 볼 수 있는 타일
         self.visible = np.full((width, height), fill_value=False, order="F")
         self.explored = np.full(
             (width, height), fill_value=False, order="F")  # 플레이어가 봤었던 타일
 
+        # 플레이어가 남긴 냄새, 시야 밖의 적이 이 값이 커지는 쪽으로 쫓아간다.
+        self.scent = np.zeros((width, height), dtype=np.float32, order="F")
+
         self.downstairs_location = (0, 0)
 
     @property
     def gamemap(self) -> GameMap:
         return self
 
+    def fork(self, engine: Engine) -> GameMap:
+        """
+        `engine`에 속하는 이 맵의 복제본을 리턴.
+
+        타일 배열은 양쪽 모두 읽기 전용으로 만들어 공유하고(copy-on-write, 바꿀 때는 edit_tiles를 거친다),
+        시야 배열과 엔티티, 컴포넌트는 복제한다. 플레이어의 복제본은 engine.player가 된다.
+        """
+        fork = GameMap(
+            engine, self.width, self.height, columnar_entities=self.columns is not None,
+            compact_corpses=self.compact_corpses, activity_radius=self.activity_radius,
+        )
+        # 타일을 공유하므로 시야도 같다. 캐시의 키가 맞도록 투명도 버전도 따른다.
+        fork.fov_cache = self.fov_cache
+        fork.transparency_version = self.transparency_version
+        self.tiles.flags.writeable = False
+        fork.tiles = self.tiles
+        fork.visible = self.visible.copy(order="F")
+        fork.explored = self.explored.copy(order="F")
+        fork.scent = self.scent.copy(order="F")
+        fork.downstairs_location = self.downstairs_location
+        fork.room_graph = self.room_graph
+        fork.decals = self.decals.copy(order="F")
+        fork.decal_names = {location: list(names) for location, names in self.decal_names.items()}
+
+        clones = {}
+        for entity in self.entities:
+            clone = clones[entity] = entity.clone()
+            clone.parent = fork
+            fork.add_entity(clone)
+            if entity is self.engine.player:
+                engine.player = clone
+
+        for actor in self._dormant_chunks:
+            fork._sleep_actor(clones[actor])
+        fork.scheduler = self.scheduler.fork(clones)
+
+        return fork
+
+    @property
+    def passable(self) -> np.ndarray:
+        """걸을 수 있고 이동을 막는 엔티티가 없는 타일이면 True인 배열을 리턴"""
+        return self.tiles["walkable"] & (self.occupancy == 0)
+
     @property
     def actors(self) -> Iterator[Actor]:
         """맵의 살아있는 Actor에게 모두 반복"""
-        yield from (entity for entity in self.entities if isinstance(entity, Actor) and entity.is_alive)
+        # 반복 중에 Actor가 죽어도 안전하도록 복사본을 순회
+        yield from tuple(self._live_actors)
+
+    @property
+    def awake_actors(self) -> Iterator[Actor]:
+        """이번 턴에 행동할, 잠들지 않은 살아있는 Actor에게 모두 반복"""
+        yield from tuple(self._awake_actors)
+
+    @property
+    def corpses(self) -> Iterator[Actor]:
+        """맵의 죽은 Actor에게 모두 반복"""
+        yield from tuple(self._corpses)
 
     @property
     def items(self) -> Iterator[Item]:
-        yield from (entity for entity in self.entities if isinstance(entity, Item))
+        yield from tuple(self._items)
+
+    def add_entity(self, entity: Entity) -> None:
+        """엔티티를 맵과 위치 인덱스, 종류별 목록에 추가"""
+        self.entities.add(entity)
+        self.entity_index.setdefault((entity.x, entity.y), []).append(entity)
+        self._register(entity)
+        self._update_occupancy(entity)
+        if self.columns is not None:
+            self.columns.add(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """엔티티를 맵과 위치 인덱스, 종류별 목록에서 제거"""
+        self.entities.remove(entity)
+        self._unindex(entity, entity.x, entity.y)
+        self._unregister(entity)
+        if entity in self._blockers:
+            self._blockers.remove(entity)
+            self._change_occupancy(entity.x, entity.y, -1)
+        if self.columns is not None:
+            self.columns.remove(entity)
+
+    def refresh_entity(self, entity: Entity) -> None:
+        """엔티티의 상태가 바뀐 후(예: 사망) 종류별 목록과 열 저장소를 갱신"""
+        self._unregister(entity)
+        self._register(entity)
+        self._update_occupancy(entity)
+        if self.columns is not None:
+            self.columns.update(entity)
+
+    def compact_corpse(self, corpse: Actor) -> None:
+        """시체 엔티티를 맵에서 제거하고 그 타일의 데칼로 남김"""
+        self.remove_entity(corpse)
+        self.decals[corpse.x, corpse.y] = (ord(corpse.char), corpse.color, (0, 0, 0))
+        self.decal_names.setdefault((corpse.x, corpse.y), []).append(corpse.name)
+
+    def get_decal_names_at_location(self, x: int, y: int) -> List[str]:
+        """주어진 타일에 남은 데칼의 이름 목록을 리턴"""
+        return self.decal_names.get((x, y), [])
+
+    def _update_occupancy(self, entity: Entity) -> None:
+        """엔티티의 blocks_movement가 바뀌었으면 점유 배열에 반영"""
+        if entity.blocks_movement and entity not in self._blockers:
+            self._blockers.add(entity)
+            self._change_occupancy(entity.x, entity.y, 1)
+        elif not entity.blocks_movement and entity in self._blockers:
+            self._blockers.remove(entity)
+            self._change_occupancy(entity.x, entity.y, -1)
+
+    def _change_occupancy(self, x: int, y: int, amount: int) -> None:
+        """점유 배열을 바꾸고, 타일이 막히거나 풀리면 캐시된 cost 배열도 고친다."""
+        was_blocked = self.occupancy[x, y] > 0
+        self.occupancy[x, y] += amount
+        self.occupancy_version += 1
+
+        if self._path_cost is not None and was_blocked != (self.occupancy[x, y] > 0) and self._path_cost[x, y]:
+            self._path_cost[x, y] += -BLOCKER_PATH_COST if was_blocked else BLOCKER_PATH_COST
+
+    def _register(self, entity: Entity) -> None:
+        if isinstance(entity, Actor):
+            if entity.is_alive:
+                # 새 Actor는 깨어있는 상태로 시작하고, 할 일이 없으면 다음 update_activity에서 잠든다.
+                self._live_actors.add(entity)
+                self._awake_actors.add(entity)
+                self.scheduler.schedule(entity)
+                self.status_effects.track(entity)
+            else:
+                self._corpses.add(entity)
+        elif isinstance(entity, Item):
+            self._items.add(entity)
+
+    def _unregister(self, entity: Entity) -> None:
+        self._live_actors.discard(entity)
+        self._awake_actors.discard(entity)
+        self.scheduler.unschedule(entity)
+        if isinstance(entity, Actor):
+            self.status_effects.untrack(entity)
+        if entity in self._dormant_chunks:
+            self._remove_dormant(entity)
+        self._corpses.discard(entity)
+        self._items.discard(entity)
+
+    def _add_dormant(self, actor: Actor) -> None:
+        chunk = actor.x // WAKE_CHUNK_SIZE, actor.y // WAKE_CHUNK_SIZE
+        self._dormant_chunks[actor] = chunk
+        self._dormant_index.setdefault(chunk, set()).add(actor)
+
+    def _remove_dormant(self, actor: Actor) -> None:
+        chunk = self._dormant_chunks.pop(actor)
+        dormant_in_chunk = self._dormant_index[chunk]
+        dormant_in_chunk.remove(actor)
+        if not dormant_in_chunk:
+            del self._dormant_index[chunk]
+
+    def is_dormant(self, actor: Actor) -> bool:
+        return actor in self._dormant_chunks
+
+    def wake_actor(self, actor: Actor) -> None:
+        """잠든 Actor를 깨우고 다음 차례를 예약"""
+        if actor in self._dormant_chunks:
+            self._remove_dormant(actor)
+            self._awake_actors.add(actor)
+            self.scheduler.schedule(actor)
+
+    def _sleep_actor(self, actor: Actor) -> None:
+        self._awake_actors.remove(actor)
+        self.scheduler.unschedule(actor)
+        self._add_dormant(actor)
+
+    def _dormant_actors_near(self, x: int, y: int, reach: int) -> Iterator[Actor]:
+        """(x, y)를 중심으로 한 변이 2 * reach + 1인 사각형과 겹치는 칸의 잠든 Actor에게 반복"""
+        for chunk_x in range(max(0, x - reach) // WAKE_CHUNK_SIZE, min(self.width - 1, x + reach) // WAKE_CHUNK_SIZE + 1):
+            for chunk_y in range(
+                max(0, y - reach) // WAKE_CHUNK_SIZE, min(self.height - 1, y + reach) // WAKE_CHUNK_SIZE + 1
+            ):
+                yield from tuple(self._dormant_index.get((chunk_x, chunk_y), ()))
+
+    def update_activity(self, x: int, y: int, visible_entities: Collection[Entity]) -> None:
+        """
+        플레이어 위치 (x, y)를 기준으로 Actor를 깨우거나 재움.
+
+        activity_radius 안에 있거나 시야 안에 있는(`visible_entities`) 잠든 Actor는 깨어나고,
+        그 밖에서 할 일이 없는(AI가 idle인) Actor는 잠든다.
+        잠든 Actor는 칸 단위 인덱스로 찾으므로 비용은 주변과 시야 안의 엔티티 수에만 비례한다.
+        """
+        radius = self.activity_radius
+        if radius is None:
+            return
+
+        for actor in self._dormant_actors_near(x, y, radius):
+            if max(abs(actor.x - x), abs(actor.y - y)) <= radius:
+                self.wake_actor(actor)
+        for entity in visible_entities:
+            if entity in self._dormant_chunks:
+                self.wake_actor(entity)
+
+        for actor in tuple(self._awake_actors):
+            if max(abs(actor.x - x), abs(actor.y - y)) <= radius or actor in visible_entities:
+                continue
+            if actor.ai is None or (actor.ai.is_idle and not actor.status_effects):
+                self._sleep_actor(actor)
+
+    def make_noise(self, x: int, y: int, radius: float) -> None:
+        """(x, y)에서 radius 안의 Actor를 깨우고 소리가 난 곳을 알림"""
+        for actor in self.get_actors_within_radius(x, y, radius):
+            self.wake_actor(actor)
+            if actor.ai:
+                actor.ai.hear_noise(x, y)
+
+    def relocate_entity(self, entity: Entity, old_x: int, old_y: int) -> None:
+        """엔티티의 좌표가 (old_x, old_y)에서 바뀐 후 위치 인덱스를 갱신"""
+        self._unindex(entity, old_x, old_y)
+        self.entity_index.setdefault((entity.x, entity.y), []).append(entity)
+        if entity in self._blockers:
+            self._change_occupancy(old_x, old_y, -1)
+            self._change_occupancy(entity.x, entity.y, 1)
+        if entity in self._dormant_chunks:
+            self._remove_dormant(entity)
+            self._add_dormant(entity)
+        if self.columns is not None:
+            self.columns.update_position(entity)
+
+    def _unindex(self, entity: Entity, x: int, y: int) -> None:
+        entities_at_location = self.entity_index[x, y]
+        entities_at_location.remove(entity)
+        if not entities_at_location:
+            del self.entity_index[x, y]
+
+    def get_entities_at_location(self, x: int, y: int) -> List[Entity]:
+        """주어진 타일에 있는 엔티티 목록을 리턴"""
+        return self.entity_index.get((x, y), [])
 
     def get_blocking_entity_at_location(self, location_x: int, location_y: int,) -> Optional[Entity]:
-        for entity in self.entities:
-            if entity.blocks_movement and entity.x == location_x and entity.y == location_y:
+        for entity in self.get_entities_at_location(location_x, location_y):
+            if entity.blocks_movement:
                 return entity
 
         return None
 
     def get_actor_at_location(self, x: int, y: int) -> Optional[Actor]:
-        for actor in self.actors:
-            if actor.x == x and actor.y == y:
-                return actor
+        for entity in self.get_entities_at_location(x, y):
+            if isinstance(entity, Actor) and entity.is_alive:
+                return entity
 
         return None
 
+    def get_items_at_location(self, x: int, y: int) -> Iterator[Item]:
+        """주어진 타일에 있는 아이템에게 모두 반복"""
+        yield from (entity for entity in self.get_entities_at_location(x, y) if isinstance(entity, Item))
+
+    def _candidate_actors(self, x: int, y: int, radius: float) -> Iterable[Actor]:
+        """
+        (x, y)에서 radius 안에 있을 수 있는 살아있는 Actor를 리턴.
+        주변 사각형이 Actor 수보다 작으면 위치 인덱스로, 아니면 Actor 목록으로 찾는다.
+        """
+        reach = int(radius)
+        if (2 * reach + 1) ** 2 >= len(self._live_actors):
+            return tuple(self._live_actors)
+
+        candidates = []
+        for tile_x in range(max(0, x - reach), min(self.width, x + reach + 1)):
+            for tile_y in range(max(0, y - reach), min(self.height, y + reach + 1)):
+                for entity in self.entity_index.get((tile_x, tile_y), ()):
+                    if entity in self._live_actors:
+                        candidates.append(entity)
+        return candidates
+
+    def get_actors_within_radius(self, x: int, y: int, radius: float) -> List[Actor]:
+        """(x, y)에서 유클리드 거리로 radius 이내에 있는 살아있는 Actor를 리턴"""
+        if self.columns is not None:
+            return self.columns.actors_within_radius(x, y, radius)
+
+        radius_squared = radius * radius
+        return [
+            actor for actor in self._candidate_actors(x, y, radius)
+            if (actor.x - x) ** 2 + (actor.y - y) ** 2 <= radius_squared
+        ]
+
+    def get_nearest_visible_actor(
+        self, x: int, y: int, max_distance: float, exclude: Optional[Actor] = None,
+    ) -> Optional[Actor]:
+        """(x, y)에서 거리가 max_distance 미만이고 시야 안에 있는 가장 가까운 살아있는 Actor를 리턴"""
+        if self.columns is not None:
+            return self.columns.nearest_actor(x, y, max_distance, visible=self.visible, exclude=exclude)
+
+        nearest = None
+        closest_distance_squared = max_distance * max_distance
+        for actor in self._candidate_actors(x, y, max_distance):
+            if actor is exclude or not self.visible[actor.x, actor.y]:
+                continue
+            distance_squared = (actor.x - x) ** 2 + (actor.y - y) ** 2
+            if distance_squared < closest_distance_squared:
+                nearest = actor
+                closest_distance_squared = distance_squared
+
+        return nearest
+
+    def get_entities_in_mask(self, mask: np.ndarray) -> List[Entity]:
+        """(width, height) 모양의 `mask`에서 True인 타일 위에 있는 엔티티를 좌표 배열로 한번에 골라서 리턴"""
+        if self.columns is not None:
+            return self.columns.entities_in_mask(mask)
+
+        entities = list(self.entities)
+        if not entities:
+            return []
+        xs = np.fromiter((entity.x for entity in entities), dtype=np.intp, count=len(entities))
+        ys = np.fromiter((entity.y for entity in entities), dtype=np.intp, count=len(entities))
+        return [entities[index] for index in np.flatnonzero(mask[xs, ys])]
+
+    def get_actors_in_mask(self, mask: np.ndarray) -> List[Actor]:
+        """(width, height) 모양의 `mask`에서 True인 타일 위에 있는 살아있는 Actor를 리턴"""
+        if self.columns is not None:
+            return self.columns.actors_in_mask(mask)
+
+        return [actor for actor in self._live_actors if mask[actor.x, actor.y]]
+
+    def get_path_cost(self) -> np.ndarray:
+        """
+        경로 계산에 쓰는 cost 배열을 리턴. 0은 지나갈 수 없는 타일.
+        캐시된 배열이므로 읽기만 해야 한다.
+
+        엔티티가 경로를 막고, 코스트가 0이 아닐경우(막힘) 막힌 경로에 cost 추가
+        낮은 숫자는 더 많은 적으로 둘러쌓일 걸을 의미.
+        높은 숫자는 적들이 플레이어를 감싸기까지 오래 걸릴것을 의미.
+        """
+        if self._path_cost is None:
+            cost = np.array(self.tiles["walkable"], dtype=np.int8)
+            cost[(self.occupancy > 0) & (cost > 0)] += BLOCKER_PATH_COST
+            self._path_cost = cost
+        return self._path_cost
+
+    def get_path_graph(self) -> tcod.path.SimpleGraph:
+        """캐시된 cost 배열을 참조하는 경로 그래프를 리턴"""
+        if self._path_graph is None:
+            self._path_graph = tcod.path.SimpleGraph(cost=self.get_path_cost(), cardinal=2, diagonal=3)
+        return self._path_graph
+
+    def edit_tiles(self) -> np.ndarray:
+        """
+        바꿔도 되는 타일 배열을 리턴, 바꾼 후에는 tiles_changed를 호출한다.
+
+        fork로 다른 맵과 공유하는 읽기 전용 타일이면 이 맵만 쓸 복사본으로 바꾸고,
+        함께 쓰던 시야 캐시도 떼어낸다. 다른 맵의 타일과 캐시는 그대로 남는다.
+        """
+        if not self.tiles.flags.writeable:
+            self.tiles = self.tiles.copy(order="F")
+            if self.fov_cache is not None:
+                self.fov_cache = FovCache(self.fov_cache.max_entries)
+        return self.tiles
+
+    def tiles_changed(self) -> None:
+        """타일을 바꾼 후 호출, 타일에서 계산한 캐시를 버린다."""
+        self._path_cost = None
+        self._path_graph = None
+        self.transparency_version += 1
+        if self.fov_cache is not None:
+            self.fov_cache.clear()
+
+    def __getstate__(self) -> dict:
+        """저장할 때 다시 만들 수 있는 경로 캐시는 뺀다."""
+        state = self.__dict__.copy()
+        state["_path_cost"] = None
+        state["_path_graph"] = None
+        return state
+
+    def compute_distance_map(self, x: int, y: int) -> np.ndarray:
+        """(x, y)에서 모든 타일까지의 경로 거리를 리턴, 닿을 수 없는 타일은 정수 최대값"""
+        pathfinder = tcod.path.Pathfinder(self.get_path_graph())
+        pathfinder.add_root((x, y))
+        pathfinder.resolve()
+        return pathfinder.distance
+
+    def find_path(self, start_x: int, start_y: int, goal_x: int, goal_y: int) -> List[Tuple[int, int]]:
+        """
+        (start_x, start_y)에서 (goal_x, goal_y)까지의 경로를 리턴, 시작 타일은 빼고 목표 타일은 포함한다.
+        유효한 길이 없으면 빈 리스트를 반환
+
+        멀리 떨어져 있으면 방 그래프로 탐색 없이 만들고, 그럴 수 없거나 너무 돌아가면 맵 전체에서 찾는다.
+        가장 짧은 경로는 직선보다 짧을 수 없으므로, 방 그래프의 경로는 가장 짧은 경로의 ROOM_PATH_MAX_DETOUR배를 넘지 않는다.
+        """
+        start, goal = (start_x, start_y), (goal_x, goal_y)
+        if self.room_graph is not None and max(abs(goal_x - start_x), abs(goal_y - start_y)) >= ROOM_PATH_MIN_DISTANCE:
+            path = self.room_graph.find_path(start, goal)
+            # 방 그래프는 이동을 막는 엔티티를 모르므로, 첫 걸음이 막혀있으면 맵 전체에서 돌아갈 길을 찾는다.
+            if (
+                path and not self.occupancy[path[0]]
+                and path_cost(path, start) <= ROOM_PATH_MAX_DETOUR * chebyshev_cost(start, goal)
+            ):
+                return path
+
+        # 걸을 수 있는 타일과 막힌 타일의 cost 배열로 만든 그래프, pathfinder는 그래프를 통해 길을 찾는다.
+        pathfinder = tcod.path.Pathfinder(self.get_path_graph())
+        pathfinder.add_root(start)  # 시작위치
+
+        # 목적지까지의 경로를 계산하고 시작지점 삭제
+        path: List[List[int]] = pathfinder.path_to(goal)[1:].tolist()
+
+        # List[List[int]]를 List[Tuple[int,int]]로 변환
+        return [(index[0], index[1]) for index in path]
+
+    def compute_fov(self, x: int, y: int, radius: int, algorithm: int = FOV_RESTRICTIVE) -> FovWindow:
+        """
+        (x, y)에서 반지름 radius 안의 시야를 (창, 창 크기의 시야 배열)로 리턴.
+
+        fov_cache가 있으면 같은 시점과 타일에서 계산한 결과를 다시 쓴다. 리턴한 배열은 고쳐도 된다.
+        """
+        if self.fov_cache is None:
+            return compute_fov_window(self.tiles["transparent"], x, y, radius, algorithm)
+
+        key = (x, y, radius, algorithm, self.transparency_version)
+        cached = self.fov_cache.get(key)
+        if cached is not None:
+            return cached
+        window, fov = compute_fov_window(self.tiles["transparent"], x, y, radius, algorithm)
+        self.fov_cache.put(key, window, fov)
+        return window, fov
+
+    def update_scent(self, x: int, y: int) -> None:
+        """
+        냄새를 한 턴 진행시키고 (x, y)에 플레이어의 냄새를 남김.
+
+        모든 타일이 이웃 8칸 중 가장 강한 냄새의 SCENT_SPREAD배까지 냄새를 받은 다음 SCENT_DECAY배로 약해진다.
+        벽에는 냄새가 남지 않는다. 배열을 밀어서 비교하는 NumPy 연산만 쓴다.
+        """
+        spread = self.scent * SCENT_SPREAD
+        scent = self.scent.copy(order="F")
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)):
+            # 각 타일이 (dx, dy)만큼 떨어진 이웃의 냄새를 받음
+            target = scent[max(0, -dx): self.width - max(0, dx), max(0, -dy): self.height - max(0, dy)]
+            source = spread[max(0, dx): self.width - max(0, -dx), max(0, dy): self.height - max(0, -dy)]
+            np.maximum(target, source, out=target)
+
+        scent *= SCENT_DECAY
+        scent *= self.tiles["walkable"]
+        scent[scent < SCENT_MIN] = 0
+        scent[x, y] = SCENT_STRENGTH
+        self.scent = scent
+
     def in_bounds(self, x: int, y: int) -> bool:
         """만약 x와 y가 맵의 경계 안이면 True를 출력"""
         return 0 <= x < self.width and 0 <= y < self.height
@@ -71,14 +557,32 @@ class GameMap:
             default=tile_types.SHROUD,
         )
 
-        entities_sorted_for_rendering = sorted(
-            self.entities, key=lambda x: x.render_order.value)
+        # 시야 내의 데칼은 엔티티보다 먼저 그림, 배경색은 타일의 것을 유지
+        decal_mask = self.visible & (self.decals["ch"] != 0)
+        if decal_mask.any():
+            tiles_rgb = console.tiles_rgb[0: self.width, 0: self.height]
+            tiles_rgb["ch"][decal_mask] = self.decals["ch"][decal_mask]
+            tiles_rgb["fg"][decal_mask] = self.decals["fg"][decal_mask]
+
+        visibility = self.engine.visibility
+        if visibility.game_map is self:
+            # 시야를 갱신할 때 골라둔 엔티티만 그림, 그 후에 옮겨지거나 맵을 떠난 엔티티는 뺀다.
+            entities_sorted_for_rendering = sorted(
+                (entity for entity in visibility.entities
+                 if entity.parent is self and self.visible[entity.x, entity.y]),
+                key=lambda x: x.render_order.value)
+        elif self.columns is not None:
+            # 열 저장소가 있으면 시야 내의 엔티티를 한번에 골라 정렬
+            entities_sorted_for_rendering = self.columns.visible_in_render_order(self.visible)
+        else:
+            entities_sorted_for_rendering = sorted(
+                (entity for entity in self.entities if self.visible[entity.x, entity.y]),
+                key=lambda x: x.render_order.value)
 
         for entity in entities_sorted_for_rendering:
             # 시야 내의 엔티티만 표현
-            if self.visible[entity.x, entity.y]:
-                console.print(x=entity.x, y=entity.y,
-                              string=entity.char, fg=entity.color)
+            console.print(x=entity.x, y=entity.y,
+                          string=entity.char, fg=entity.color)
 
 
 class GameWorld:
@@ -88,7 +592,8 @@ class GameWorld:
 
     def __init__(
             self, *, engine: Engine, map_width: int, map_height: int, max_rooms: int,
-            room_min_size: int, room_max_size: int, current_floor: int = 0):
+            room_min_size: int, room_max_size: int, current_floor: int = 0, columnar_entities: bool = False,
+            compact_corpses: bool = False, activity_radius: Optional[int] = None, fov_cache_size: Optional[int] = None):
         self.engine = engine
         
         self.map_width = map_width
@@ -101,6 +606,15 @@ class GameWorld:
 
         self.current_floor = current_floor
 
+        # True면 새로 생성되는 맵이 엔티티를 NumPy 열 저장소에도 보관한다.
+        self.columnar_entities = columnar_entities
+        # True면 새로 생성되는 맵이 시체를 데칼로 압축한다.
+        self.compact_corpses = compact_corpses
+        # 새로 생성되는 맵의 activity_radius, 멀리 있는 할 일 없는 Actor는 잠든다.
+        self.activity_radius = activity_radius
+        # 새로 생성되는 맵의 시야 캐시 크기(시점 수), None이면 캐시하지 않는다.
+        self.fov_cache_size = fov_cache_size
+
     def generate_floor(self) -> None:
         from procgen import generate_dungeon
 
@@ -113,4 +627,8 @@ class GameWorld:
             map_width=self.map_width,
             map_height=self.map_height,
             engine=self.engine,
+            columnar_entities=self.columnar_entities,
+            compact_corpses=self.compact_corpses,
+            activity_radius=self.activity_radius,
+            fov_cache_size=self.fov_cache_size,
         )
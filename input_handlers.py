@@ -78,6 +78,11 @@ class BaseEventHandler(tcod.event.EventDispatch[ActionOrHandler]):
     def on_render(self, console: tcod.Console) -> None:
         raise NotImplementedError()
 
+    @property
+    def render_version(self) -> int:
+        """on_render의 결과가 바뀔 수 있을 때마다 달라지는 값, 핸들러가 바뀌지 않는 동안 같으면 다시 그리지 않는다."""
+        return 0
+
     def ev_quit(self, event: tcod.event.Quit) -> Optional[Action]:
         raise SystemExit()
 
@@ -89,6 +94,10 @@ class PopupMessage(BaseEventHandler):
         self.parent = parent_gandler
         self.text = text
 
+    @property
+    def render_version(self) -> int:
+        return self.parent.render_version
+
     def on_render(self, console: tcod.Console) -> None:
         """parent와 dim(?)을 결과로 그리고, 그 다음 메세지를 위에 띄운다."""
         self.parent.on_render(console)
@@ -107,8 +116,15 @@ class EventHandler(BaseEventHandler):
     def __init__(self, engine: Engine):
         self.engine = engine
 
+    @property
+    def render_version(self) -> int:
+        return self.engine.render_version
+
     def handle_events(self, event: tcod.event.Event) -> BaseEventHandler:
         """엔진에 관한 InputHandler를 위한 event를 관리."""
+        if not isinstance(event, tcod.event.MouseMotion):
+            # 키 입력 등은 커서, 메세지, 게임 상태를 바꿀 수 있다. 마우스 이동은 ev_mousemotion에서 확인한다.
+            self.engine.render_version += 1
         action_or_state = self.dispatch(event)
         if isinstance(action_or_state, BaseEventHandler):
             return action_or_state
@@ -145,7 +161,10 @@ class EventHandler(BaseEventHandler):
 
     def ev_mousemotion(self, event: tcod.event.MouseMotion) -> None:
         if self.engine.game_map.in_bounds(event.tile.x, event.tile.y):
-            self.engine.mouse_location = event.tile.x, event.tile.y
+            if self.engine.mouse_location != (event.tile.x, event.tile.y):
+                # 같은 타일 안에서의 움직임은 화면을 바꾸지 않는다.
+                self.engine.mouse_location = event.tile.x, event.tile.y
+                self.engine.render_version += 1
 
     def on_render(self, console: tcod.Console) -> None:
         self.engine.render(console)
@@ -277,7 +296,7 @@ class InventoryEventHandler(AskUserEventHandler):
                 
                 is_equipped = self.engine.player.equipment.item_is_equipped(item)
 
-                item_string = f"({item_key}) {item.name}"
+                item_string = f"({item_key}) {item.display_name}"
 
                 if is_equipped:
                     item_string = f"{item_string} (E)"
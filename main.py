@@ -4,9 +4,13 @@ import tcod
 
 import color
 import exceptions
+from frame_scheduler import FrameScheduler
 import input_handlers
 import setup_game
 
+# 초당 최대 화면 갱신 횟수, 이 간격 안에 온 이벤트는 모아서 한번에 그린다.
+MAX_FPS = 60
+
 def save_game(handler: input_handlers.BaseEventHandler, filename:str) -> None:
     """만약 현재 event handler가 active Engine을 가지고 있다면 저장한다."""
     if isinstance(handler, input_handlers.EventHandler):
@@ -28,15 +32,23 @@ def main() -> None:
                                    vsync=True,
                                    ) as context:
         root_console = tcod.Console(screen_width, screen_height, order="F")
+        frames = FrameScheduler(max_fps=MAX_FPS)
         try:
             while True:
-                root_console.clear()
-                handler.on_render(console=root_console)
-                context.present(root_console)
+                # 핸들러나 그 상태가 바뀌었을 때만 다시 그린다.
+                frame_key = (handler, handler.render_version)
+                if frames.should_render(frame_key):
+                    root_console.clear()
+                    handler.on_render(console=root_console)
+                    context.present(root_console)
+                    frames.rendered(frame_key)
 
                 try:
-                    for event in tcod.event.wait():
+                    # 그릴 것이 미뤄져 있으면 다음 프레임까지만, 아니면 이벤트가 올 때까지 기다린다.
+                    for event in tcod.event.wait(timeout=frames.timeout(frame_key)):
                         context.convert_event(event)
+                        if isinstance(event, tcod.event.WindowEvent):
+                            frames.invalidate()  # 창이 다시 보이거나 크기가 바뀜
                         handler = handler.handle_events(event)
                 except Exception:  # 예외 관리
                     traceback.print_exc()  # stderr에 출력
@@ -44,6 +56,7 @@ def main() -> None:
                     if isinstance(handler, input_handlers.EventHandler):
                         handler.engine.message_log.add_message(
                             traceback.format_exc(), color.error)
+                    frames.invalidate()
         except exceptions.QuitWithoutSaving:
             raise
         except SystemExit:  # 저장 후 종료
@@ -34,6 +34,16 @@ class MessageLog:
         else:
             self.messages.append(Message(text, fg))
 
+    def fork(self) -> "MessageLog":
+        """메세지 목록을 복제한 로그를 리턴, 쌓일 수 있는 마지막 메세지만 새로 만든다."""
+        fork = MessageLog()
+        fork.messages = list(self.messages)
+        if fork.messages:
+            last = fork.messages[-1]
+            fork.messages[-1] = Message(last.plain_text, last.fg)
+            fork.messages[-1].count = last.count
+        return fork
+
     def render(self, console: tcod.Console, x: int, y: int, width: int, height: int,) -> None:
         """주어진 장소에 로그를 그림."""
         self.render_messages(console, x, y, width, height, self.messages)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import random
-from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+from typing import Dict, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
 
 import tcod
 
 import entity_factories
 from game_map import GameMap
+from room_graph import RoomGraph
 import tile_types
 
 if TYPE_CHECKING:
@@ -34,6 +35,7 @@ item_chances: Dict[int, List[Tuple[Entity, int]]] = {
 enemy_chances: Dict[int, List[Tuple[Entity, int]]] = {
     0: [(entity_factories.orc, 80)],
     2: [(entity_factories.troll, 15)],
+    3: [(entity_factories.archer, 20)],
     4: [(entity_factories.troll, 30)],
     6: [(entity_factories.troll, 60)],
 }
@@ -105,12 +107,20 @@ def place_entities(room: RectangularRoom, dungeon: GameMap, floor_number: int,)
     monsters: List[Entity] = get_entities_at_random(enemy_chances, number_of_monsters, floor_number)
     items: List[Entity] = get_entities_at_random(item_chances, number_of_items, floor_number)
 
+    # 템플릿별로 위치를 모아서 한번에 spawn한다.
+    locations_by_template: Dict[Entity, List[Tuple[int, int]]] = {}
+    taken: Set[Tuple[int, int]] = set()
+
     for entity in monsters + items:
         x = random.randint(room.x1 + 1, room.x2 - 1)
         y = random.randint(room.y1 + 1, room.y2 - 1)
 
-        if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
-            entity.spawn(dungeon, x, y)
+        if (x, y) not in taken and not dungeon.get_entities_at_location(x, y):
+            taken.add((x, y))
+            locations_by_template.setdefault(entity, []).append((x, y))
+
+    for entity, locations in locations_by_template.items():
+        entity.spawn_many(dungeon, locations)
 
 def tunnel_between(start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
     """두 점 사이에 L모양의 통로를 리턴."""
@@ -130,12 +140,20 @@ def tunnel_between(start: Tuple[int, int], end: Tuple[int, int]) -> Iterator[Tup
         yield x, y
 
 
-def generate_dungeon(max_rooms: int, room_min_size: int, room_max_size: int, map_width: int, map_height: int, engine: Engine,) -> GameMap:
+def generate_dungeon(
+    max_rooms: int, room_min_size: int, room_max_size: int, map_width: int, map_height: int, engine: Engine,
+    columnar_entities: bool = False, compact_corpses: bool = False, activity_radius: Optional[int] = None,
+    fov_cache_size: Optional[int] = None,
+) -> GameMap:
     """새로운 던전 맵을 생성"""
     player = engine.player
-    dungeon = GameMap(engine, map_width, map_height, entities=[player])
+    # 플레이어는 첫번째 방에 배치될 때 맵에 추가된다.
+    dungeon = GameMap(
+        engine, map_width, map_height, columnar_entities=columnar_entities, compact_corpses=compact_corpses,
+        activity_radius=activity_radius, fov_cache_size=fov_cache_size)
 
     rooms: List[RectangularRoom] = []
+    tunnels: List[List[Tuple[int, int]]] = []
 
     center_of_last_room = (0, 0)
 
@@ -162,8 +180,10 @@ def generate_dungeon(max_rooms: int, room_min_size: int, room_max_size: int, map
             player.place(*new_room.center, dungeon)
         else:
             # 이전 방과 터널로 연결
-            for x, y in tunnel_between(rooms[-1].center, new_room.center):
+            tunnel = list(tunnel_between(rooms[-1].center, new_room.center))
+            for x, y in tunnel:
                 dungeon.tiles[x, y] = tile_types.floor
+            tunnels.append(tunnel)
 
             center_of_last_room = new_room.center
 
@@ -175,4 +195,13 @@ def generate_dungeon(max_rooms: int, room_min_size: int, room_max_size: int, map
         # 새로운 방을 목록에 추가
         rooms.append(new_room)
 
+    # 방과 터널을 그래프로 남겨서 먼 거리의 경로 계산에 쓴다.
+    # 나중에 만든 방이 앞선 터널 위에 생길 수 있으므로 모든 방을 넣은 후에 터널을 잇는다.
+    dungeon.room_graph = RoomGraph(map_width, map_height)
+    for room in rooms:
+        dungeon.room_graph.add_room(room)
+    for tunnel in tunnels:
+        dungeon.room_graph.add_tunnel(tunnel)
+
+    dungeon.tiles_changed()
     return dungeon
@@ -0,0 +1,69 @@
+"""
+copy.deepcopy 없이 템플릿(프로토타입)에서 엔티티와 컴포넌트를 복제하는 도우미.
+
+__slots__를 쓰는 클래스마다 복사할 슬롯 이름을 한번만 계산해두고,
+복제할 때는 그 목록을 따라 값을 얕게 복사한다.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+# 복제할 때 복사하지 않는 슬롯, parent는 복제본을 붙이는 쪽에서 설정한다.
+EXCLUDED_SLOTS = frozenset({"parent"})
+
+_slot_names_cache: Dict[type, Tuple[str, ...]] = {}
+_cloner_cache: Dict[type, Callable[[object], object]] = {}
+
+
+def slot_names(cls: type) -> Tuple[str, ...]:
+    """클래스와 부모 클래스에 선언된 슬롯 중 복사할 이름을 리턴"""
+    names = _slot_names_cache.get(cls)
+    if names is None:
+        seen = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for name in slots:
+                if name not in EXCLUDED_SLOTS and name not in seen:
+                    seen.append(name)
+        names = _slot_names_cache[cls] = tuple(seen)
+    return names
+
+
+def _compile_cloner(cls: type) -> Callable[[object], object]:
+    """슬롯을 하나씩 대입하는 복제 함수를 클래스마다 한번 만들어 둔다. (dataclasses와 같은 방식)"""
+    lines = ["def clone_slots(source):", "    clone = new(cls)"]
+    lines += [f"    clone.{name} = source.{name}" for name in slot_names(cls)]
+    lines.append("    return clone")
+
+    namespace = {"cls": cls, "new": cls.__new__}
+    exec("\n".join(lines), namespace)
+    return namespace["clone_slots"]
+
+
+def _clone_set_slots(source: T) -> T:
+    """설정되지 않은 슬롯이 있을 때 쓰는 느린 복제"""
+    cls: Type[T] = type(source)
+    clone = cls.__new__(cls)
+    for name in slot_names(cls):
+        try:
+            value = getattr(source, name)
+        except AttributeError:
+            continue
+        setattr(clone, name, value)
+    return clone
+
+
+def shallow_clone(source: T) -> T:
+    """`source`와 같은 클래스의 인스턴스를 만들고 슬롯 값을 얕게 복사"""
+    cls = type(source)
+    cloner = _cloner_cache.get(cls)
+    if cloner is None:
+        cloner = _cloner_cache[cls] = _compile_cloner(cls)
+    try:
+        return cloner(source)
+    except AttributeError:
+        return _clone_set_slots(source)  # 아직 설정되지 않은 슬롯
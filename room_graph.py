@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from procgen import RectangularRoom
+
+
+def walk_in_room(start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """같은 방 안의 두 타일 사이를 대각선 우선으로 걷는 경로를 리턴, 방 내부는 모두 바닥이므로 탐색이 필요없다."""
+    x, y = start
+    goal_x, goal_y = goal
+    path = []
+    while (x, y) != goal:
+        x += (goal_x > x) - (goal_x < x)
+        y += (goal_y > y) - (goal_y < y)
+        path.append((x, y))
+    return path
+
+
+def chebyshev_cost(start: Tuple[int, int], goal: Tuple[int, int]) -> int:
+    """방 안에서 start에서 goal까지 걷는 cost(경로 그래프와 같이 가로, 세로 2, 대각선 3)"""
+    dx, dy = abs(goal[0] - start[0]), abs(goal[1] - start[1])
+    return 3 * min(dx, dy) + 2 * abs(dx - dy)
+
+
+def path_cost(path: List[Tuple[int, int]], start: Tuple[int, int]) -> int:
+    """start에서 출발하는 타일 경로의 cost(경로 그래프와 같이 가로, 세로 2, 대각선 3)를 리턴"""
+    total = 0
+    for x, y in path:
+        total += 3 if x != start[0] and y != start[1] else 2
+        start = x, y
+    return total
+
+
+class RoomLink:
+    """이웃한 두 방을 잇는 통로, 방 밖의 터널 타일을 room_a에서 room_b 방향 순서로 가진다."""
+
+    def __init__(
+        self, room_a: int, room_b: int, corridor: List[Tuple[int, int]], entry_a: Tuple[int, int], entry_b: Tuple[int, int],
+    ):
+        self.room_a = room_a
+        self.room_b = room_b
+        self.corridor = corridor
+        # 통로 양 끝 바로 옆의 방 안 타일
+        self.entry_a = entry_a
+        self.entry_b = entry_b
+        self.cost = 0  # room_a의 중심에서 room_b의 중심까지의 대략의 cost, RoomGraph가 계산한다.
+
+    def walk_from(self, room_id: int) -> Tuple[Tuple[int, int], List[Tuple[int, int]], Tuple[int, int]]:
+        """room_id에서 출발할 때의 (출발 방의 입구, 통로 타일, 도착 방의 입구)를 리턴"""
+        if room_id == self.room_a:
+            return self.entry_a, self.corridor, self.entry_b
+        return self.entry_b, self.corridor[::-1], self.entry_a
+
+    def entry_of(self, room_id: int) -> Tuple[int, int]:
+        return self.entry_a if room_id == self.room_a else self.entry_b
+
+
+class RoomGraph:
+    """
+    procgen이 만든 방(노드)과 방 사이 통로(간선)의 그래프.
+
+    먼 거리의 경로는 이 그래프에서 거쳐갈 방의 순서를 먼저 찾고(HPA*의 추상 단계),
+    타일 경로는 방 안에서는 직선으로 걷고 통로에서는 기록해둔 터널 타일을 따라가서 탐색 없이 만든다.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.rooms: List[RectangularRoom] = []
+        self.links: List[Dict[int, RoomLink]] = []  # 방마다 {이웃한 방: 통로}
+        # 타일마다 그 타일을 안에 둔 방의 번호, 방 밖이면 -1
+        self.room_ids = np.full((width, height), fill_value=-1, dtype=np.int32, order="F")
+        # 통로 타일마다 (속한 통로, 통로 안에서의 순서)
+        self.corridors: Dict[Tuple[int, int], Tuple[RoomLink, int]] = {}
+
+    def add_room(self, room: RectangularRoom) -> int:
+        """방을 노드로 추가하고 번호를 리턴"""
+        room_id = len(self.rooms)
+        self.rooms.append(room)
+        self.links.append({})
+        self.room_ids[room.inner] = room_id
+        return room_id
+
+    def add_tunnel(self, tiles: Iterable[Tuple[int, int]]) -> None:
+        """
+        터널의 타일을 순서대로 받아서, 터널이 지나는 방들을 차례로 통로로 잇는다.
+        터널은 양 끝의 방뿐 아니라 가는 길에 지나는 방도 연결한다.
+        나중에 만든 방이 앞선 터널 위에 생길 수 있으므로 모든 방을 추가한 뒤에 불러야 한다.
+        """
+        previous_room, room_tile, previous_tile = None, None, None
+        corridor: List[Tuple[int, int]] = []  # 방 밖에 있는 터널 타일
+        for x, y in tiles:
+            if (x, y) == previous_tile:
+                continue  # L모양의 모서리는 두번 나온다.
+            previous_tile = x, y
+
+            room_id = int(self.room_ids[x, y])
+            if room_id < 0:
+                corridor.append((x, y))
+                continue
+            if previous_room is not None and room_id != previous_room and corridor:
+                self._add_link(RoomLink(previous_room, room_id, corridor, room_tile, (x, y)))
+            previous_room, room_tile = room_id, (x, y)
+            corridor = []
+
+    def _add_link(self, link: RoomLink) -> None:
+        """통로를 추가, 두 방 사이에는 가장 싼 통로만 그래프의 간선으로 남긴다."""
+        center_a, center_b = self.rooms[link.room_a].center, self.rooms[link.room_b].center
+        link.cost = (
+            chebyshev_cost(center_a, link.entry_a) + 2 * (len(link.corridor) + 1) + chebyshev_cost(link.entry_b, center_b)
+        )
+        existing = self.links[link.room_a].get(link.room_b)
+        if existing is None or link.cost < existing.cost:
+            self.links[link.room_a][link.room_b] = self.links[link.room_b][link.room_a] = link
+
+        # 간선이 되지 못한 통로도 그 위의 타일에서 출발하거나 도착할 때 쓸 수 있다.
+        for index, location in enumerate(link.corridor):
+            if location not in self.corridors or self.corridors[location][0].cost > link.cost:
+                self.corridors[location] = link, index
+
+    def nodes_at(self, x: int, y: int) -> Dict[int, int]:
+        """(x, y)에서 그래프에 들어가는 방과 그 방 중심까지의 대략의 cost를 리턴, 방이나 통로 밖이면 빈 dict"""
+        room_id = int(self.room_ids[x, y])
+        if room_id >= 0:
+            return {room_id: chebyshev_cost((x, y), self.rooms[room_id].center)}
+        if (x, y) not in self.corridors:
+            return {}
+        link, index = self.corridors[x, y]
+        return {
+            link.room_a: 2 * (index + 1) + chebyshev_cost(link.entry_a, self.rooms[link.room_a].center),
+            link.room_b: 2 * (len(link.corridor) - index) + chebyshev_cost(link.entry_b, self.rooms[link.room_b].center),
+        }
+
+    def route(
+        self, start_nodes: Dict[int, int], goal_nodes: Dict[int, int], goal: Tuple[int, int],
+    ) -> Optional[List[int]]:
+        """
+        방 그래프에서 start_nodes 중 하나에서 goal_nodes 중 하나로 가는 방 번호의 순서를 리턴.
+        방 중심에서 goal까지의 직선 cost를 휴리스틱으로 쓰는 A*
+        """
+        rooms = self.rooms
+        distances = dict(start_nodes)
+        previous: Dict[int, int] = {}
+        queue = [(cost + chebyshev_cost(rooms[room_id].center, goal), cost, room_id) for room_id, cost in start_nodes.items()]
+        heapq.heapify(queue)
+
+        best_goal, best_cost = None, None
+        while queue:
+            estimate, cost, room_id = heapq.heappop(queue)
+            if best_cost is not None and estimate >= best_cost:
+                break
+            if cost > distances[room_id]:
+                continue
+            if room_id in goal_nodes and (best_cost is None or cost + goal_nodes[room_id] < best_cost):
+                best_goal, best_cost = room_id, cost + goal_nodes[room_id]
+            for neighbor, link in self.links[room_id].items():
+                new_cost = cost + link.cost
+                if neighbor not in distances or new_cost < distances[neighbor]:
+                    distances[neighbor] = new_cost
+                    previous[neighbor] = room_id
+                    heapq.heappush(queue, (new_cost + chebyshev_cost(rooms[neighbor].center, goal), new_cost, neighbor))
+
+        if best_goal is None:
+            return None
+        route = [best_goal]
+        while route[-1] in previous:
+            route.append(previous[route[-1]])
+        route.reverse()
+        return route
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        start에서 goal까지의 타일 경로를 리턴, 시작 타일은 빼고 목표 타일은 포함한다.
+
+        두 타일 모두 방이나 통로 위에 있어야 한다. 가장 짧은 경로가 아닐 수 있고, 이동을 막는 엔티티는 고려하지 않는다.
+        찾지 못하면 빈 리스트를 리턴하고, 부르는 쪽에서 맵 전체에서 찾는다.
+        """
+        start_corridor = self.corridors.get(start) if self.room_ids[start] < 0 else None
+        goal_corridor = self.corridors.get(goal) if self.room_ids[goal] < 0 else None
+        if start_corridor and goal_corridor and start_corridor[0] is goal_corridor[0]:
+            return []  # 같은 통로 위
+
+        start_nodes = self.nodes_at(*start)
+        goal_nodes = self.nodes_at(*goal)
+        if not start_nodes or not goal_nodes:
+            return []
+        route = self.route(start_nodes, goal_nodes, goal)
+        if route is None:
+            return []
+
+        path: List[Tuple[int, int]] = []
+        here = start
+        if start_corridor:
+            # 통로를 따라 첫번째 방의 입구로 나감
+            link, index = start_corridor
+            if route[0] == link.room_a:
+                path.extend(link.corridor[index - 1::-1] if index else [])
+            else:
+                path.extend(link.corridor[index + 1:])
+            path.append(link.entry_of(route[0]))
+            here = path[-1]
+
+        for room_id, next_room_id in zip(route, route[1:]):
+            entry, corridor, exit_ = self.links[room_id][next_room_id].walk_from(room_id)
+            path.extend(walk_in_room(here, entry))
+            path.extend(corridor)
+            path.append(exit_)
+            here = exit_
+
+        if goal_corridor:
+            # 마지막 방의 입구에서 통로를 따라 목표로 들어감
+            link, index = goal_corridor
+            path.extend(walk_in_room(here, link.entry_of(route[-1])))
+            if route[-1] == link.room_a:
+                path.extend(link.corridor[:index + 1])
+            else:
+                path.extend(link.corridor[index:][::-1])
+        else:
+            path.extend(walk_in_room(here, goal))
+        return path
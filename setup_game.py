@@ -1,7 +1,6 @@
 """로딩과 게임 세션의 초기화를 관리"""
 from __future__ import annotations
 
-import copy
 import lzma
 import pickle
 import traceback
@@ -29,11 +28,16 @@ def new_game() -> Engine:
     room_min_size = 6
     max_rooms = 30
 
-    player = copy.deepcopy(entity_factories.player)
+    # 플레이어에게서 이보다 멀리 있는 할 일 없는 적은 잠든다.
+    activity_radius = 16
+    # 시점 1024개까지 시야를 캐시한다. (압축해서 시점마다 약 40바이트)
+    fov_cache_size = 1024
+
+    player = entity_factories.player.clone()
 
     engine = Engine(player=player)
 
-    engine.game_world = GameWorld(max_rooms=max_rooms, room_min_size=room_min_size, room_max_size=room_max_size, map_width=map_width, map_height=map_height, engine=engine)
+    engine.game_world = GameWorld(max_rooms=max_rooms, room_min_size=room_min_size, room_max_size=room_max_size, map_width=map_width, map_height=map_height, engine=engine, activity_radius=activity_radius, fov_cache_size=fov_cache_size)
 
     engine.game_world.generate_floor()
     engine.update_fov()
@@ -41,8 +45,8 @@ def new_game() -> Engine:
     engine.message_log.add_message(
         "Hello and welcome to yet another dungeon!", color.welcome_text)
 
-    dagger = copy.deepcopy(entity_factories.dagger)
-    leather_armor = copy.deepcopy(entity_factories.leather_armor)
+    dagger = entity_factories.dagger.clone()
+    leather_armor = entity_factories.leather_armor.clone()
 
     dagger.parent = player.inventory
     leather_armor.parent = player.inventory
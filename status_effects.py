@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import copy
+import random
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import actions
+import color
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+# 타이밍 휠의 칸 수, 이보다 먼 예약은 휠을 한바퀴 더 돈 뒤에 처리된다.
+WHEEL_SIZE = 64
+
+
+class StatusEffect:
+    """
+    Actor에 걸리는 상태 효과(혼란, 독, 가속 등)의 기본 클래스.
+
+    시간은 플레이어 턴(Engine.turn) 단위이다. tick_interval이 있으면 그 간격마다 on_tick이 불린다.
+    이름이 다른 효과는 함께 걸리고, 같은 이름의 효과가 다시 걸리면 stack으로 합쳐진다.
+    """
+
+    name = "<effect>"
+    tick_interval: Optional[int] = None
+
+    def __init__(self, duration: int):
+        self.duration = duration
+        self.expires_at = 0  # 효과가 풀리는 턴
+        self.next_tick_at: Optional[int] = None  # 다음 on_tick이 불리는 턴
+
+    def clone(self) -> StatusEffect:
+        return copy.copy(self)
+
+    def stack(self, other: StatusEffect) -> None:
+        """같은 효과가 다시 걸렸을 때 합침, 기본은 더 늦게 풀리는 쪽을 따른다."""
+        self.expires_at = max(self.expires_at, other.expires_at)
+
+    def get_action(self, actor: Actor) -> Optional[actions.Action]:
+        """AI 대신 할 행동을 리턴, None이면 AI가 행동한다."""
+        return None
+
+    def on_apply(self, actor: Actor) -> None:
+        pass
+
+    def on_tick(self, actor: Actor) -> None:
+        pass
+
+    def on_expire(self, actor: Actor) -> None:
+        pass
+
+
+class Confusion(StatusEffect):
+    """혼란스러운 Actor는 목표없이 방황하고, 움직이려는 타일에 Actor가 있으면 공격한다."""
+
+    name = "confused"
+
+    def get_action(self, actor: Actor) -> Optional[actions.Action]:
+        # 무작위 방향으로 움직이거나 공격한다. 그냥 벽에 부딪히는 것도 가능하다.
+        direction_x, direction_y = random.choice(
+            [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+        )
+        return actions.BumpAction(actor, direction_x, direction_y)
+
+    def on_expire(self, actor: Actor) -> None:
+        actor.gamemap.engine.message_log.add_message(f"The {actor.name} is no longer confused.")
+
+
+class Poison(StatusEffect):
+    """매 턴 damage만큼 피해를 준다. 다시 걸리면 더 센 독과 더 긴 시간을 따른다."""
+
+    name = "poisoned"
+    tick_interval = 1
+
+    def __init__(self, duration: int, damage: int):
+        super().__init__(duration)
+        self.damage = damage
+
+    def stack(self, other: Poison) -> None:
+        super().stack(other)
+        self.damage = max(self.damage, other.damage)
+
+    def on_tick(self, actor: Actor) -> None:
+        actor.gamemap.engine.message_log.add_message(
+            f"The {actor.name} takes {self.damage} poison damage.", color.status_effect_applied)
+        actor.fighter.take_damage(self.damage)
+
+
+class Haste(StatusEffect):
+    """걸려있는 동안 속도를 두배로 한다."""
+
+    name = "hasted"
+
+    def __init__(self, duration: int):
+        super().__init__(duration)
+        self.speed_bonus = 0
+
+    def on_apply(self, actor: Actor) -> None:
+        self.speed_bonus = actor.speed
+        actor.speed += self.speed_bonus
+        self._reschedule(actor)
+
+    def on_expire(self, actor: Actor) -> None:
+        # 이미 가속된 간격으로 예약된 다음 차례는 그대로 두고, 그 다음부터 원래 속도로 예약된다.
+        actor.speed -= self.speed_bonus
+
+    @staticmethod
+    def _reschedule(actor: Actor) -> None:
+        """보통 속도로 이미 예약된 다음 차례를 바뀐 속도로 다시 예약, 그러지 않으면 한 행동 늦게 빨라진다."""
+        scheduler = actor.gamemap.scheduler
+        if actor in scheduler:
+            scheduler.schedule(actor)
+
+
+def get_forced_action(actor: Actor) -> Optional[actions.Action]:
+    """actor에 걸린 효과 중 AI를 대신하는 것이 있으면 그 행동을 리턴"""
+    for effect in actor.status_effects.values():
+        action = effect.get_action(actor)
+        if action is not None:
+            return action
+    return None
+
+
+class StatusEffectWheel:
+    """
+    맵 위 Actor들의 상태 효과의 다음 tick 또는 만료를 예약하는 타이밍 휠.
+
+    칸마다 그 턴(을 WHEEL_SIZE로 나눈 나머지)에 할 일이 있는 효과만 들어있어서,
+    턴마다 그 턴에 tick하거나 풀리는 효과만 처리하고 나머지 효과와 Actor는 방문하지 않는다.
+    효과 자체는 Actor.status_effects에 있으므로 Actor가 다른 맵으로 옮겨도 그대로 따라간다.
+    """
+
+    def __init__(self, turn: int = 0):
+        self.turn = turn  # 마지막으로 처리한 턴
+        # 칸의 항목은 [턴, Actor, 효과], 취소된 항목은 효과 자리를 None으로 바꾸고 처리할 때 버린다.
+        self._slots: List[List[list]] = [[] for _ in range(WHEEL_SIZE)]
+        self._entries: Dict[StatusEffect, list] = {}  # 효과마다 유효한 항목
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def apply(self, actor: Actor, effect: StatusEffect) -> None:
+        """
+        actor에 다음 턴부터 effect.duration 턴 동안 효과를 건다.
+
+        advance는 적이 행동하기 전에 불리므로, 풀리는 것은 마지막 턴의 다음 턴이다.
+        """
+        effect.expires_at = self.turn + effect.duration + 1
+        if effect.tick_interval:
+            effect.next_tick_at = self.turn + effect.tick_interval
+
+        existing = actor.status_effects.get(effect.name)
+        if existing is not None:
+            existing.stack(effect)
+            effect = existing
+        else:
+            actor.status_effects[effect.name] = effect
+            effect.on_apply(actor)
+        self._schedule(actor, effect)
+
+    def track(self, actor: Actor) -> None:
+        """맵에 들어온 actor에 이미 걸려있는 효과를 예약"""
+        for effect in actor.status_effects.values():
+            self._schedule(actor, effect)
+
+    def untrack(self, actor: Actor) -> None:
+        """맵을 떠나거나 죽은 actor의 예약을 취소, 효과는 actor에 남는다."""
+        for effect in actor.status_effects.values():
+            entry = self._entries.pop(effect, None)
+            if entry is not None:
+                entry[2] = None
+
+    def _schedule(self, actor: Actor, effect: StatusEffect) -> None:
+        old_entry = self._entries.get(effect)
+        if old_entry is not None:
+            old_entry[2] = None
+        turn = effect.expires_at
+        if effect.next_tick_at is not None:
+            turn = min(turn, effect.next_tick_at)
+        entry = self._entries[effect] = [turn, actor, effect]
+        self._slots[turn % WHEEL_SIZE].append(entry)
+
+    def advance(self, turn: int) -> None:
+        """turn으로 시계를 옮기고 그 턴에 tick하거나 풀리는 효과를 처리"""
+        self.turn = turn
+        index = turn % WHEEL_SIZE
+        slot = self._slots[index]
+        if not slot:
+            return
+
+        # 처리하는 동안 다시 예약되는 항목은 새 칸에 들어간다.
+        self._slots[index] = []
+        for entry in slot:
+            due, actor, effect = entry
+            if effect is None:
+                continue  # 취소된 항목
+            if due > turn:
+                self._slots[index].append(entry)  # 휠을 한바퀴 더 돌아야 하는 항목
+                continue
+            del self._entries[effect]
+
+            if effect.next_tick_at == due and due < effect.expires_at:
+                effect.next_tick_at += effect.tick_interval
+                effect.on_tick(actor)
+                if not actor.is_alive:
+                    continue  # 죽으면 GameMap이 나머지 예약도 취소한다.
+
+            if due >= effect.expires_at:
+                del actor.status_effects[effect.name]
+                effect.on_expire(actor)
+            else:
+                self._schedule(actor, effect)
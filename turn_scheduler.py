@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+# 보통 속도, Actor.speed의 기본값
+NORMAL_SPEED = 100
+# 행동 한번에 필요한 에너지, Actor는 틱마다 speed만큼 에너지를 얻는다.
+ACTION_COST = 10_000
+
+
+def action_delay(speed: int) -> int:
+    """speed인 Actor가 행동 한번에 필요한 에너지를 모으는데 걸리는 틱 수를 리턴"""
+    return max(1, ACTION_COST // speed)
+
+
+class TurnScheduler:
+    """
+    에너지(속도) 기반으로 행동 순서를 정하는 우선순위 큐.
+
+    Actor마다 에너지가 다 차는 시각을 힙에 넣어두고, 그 시각 순서로 꺼낸다.
+    시각이 같으면 먼저 예약된 Actor가 먼저 행동하므로 순서는 항상 같다.
+    예약되지 않은(잠든) Actor는 힙에 없으므로 전혀 방문하지 않는다.
+    """
+
+    def __init__(self):
+        self.time = 0  # 마지막으로 행동한 Actor의 시각
+        # 힙 항목은 [시각, 순번, Actor], 취소된 항목은 Actor 자리를 None으로 바꾸고 꺼낼 때 버린다.
+        self._heap: List[list] = []
+        self._entries: Dict[Actor, list] = {}  # Actor마다 유효한 힙 항목
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, actor: Actor) -> bool:
+        return actor in self._entries
+
+    def schedule(self, actor: Actor, delay: Optional[int] = None) -> None:
+        """actor의 다음 차례를 지금부터 delay 틱 후로 예약, 기본값은 actor의 속도로 계산한다."""
+        if delay is None:
+            delay = action_delay(actor.speed)
+        self._push(actor, self.time + delay)
+
+    def unschedule(self, actor: Actor) -> None:
+        """actor의 예약을 취소"""
+        entry = self._entries.pop(actor, None)
+        if entry is not None:
+            entry[2] = None
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._compact()
+
+    def _push(self, actor: Actor, time: int) -> None:
+        old_entry = self._entries.get(actor)
+        if old_entry is not None:
+            old_entry[2] = None
+        entry = self._entries[actor] = [time, self._sequence, actor]
+        self._sequence += 1
+        heapq.heappush(self._heap, entry)
+
+    def _compact(self) -> None:
+        """취소된 항목을 힙에서 지움, pop_before가 참조하는 리스트를 그대로 고친다."""
+        self._heap[:] = self._entries.values()
+        heapq.heapify(self._heap)
+
+    def pop_before(self, actor: Actor) -> Iterator[Actor]:
+        """
+        지금 예약된 `actor`의 차례 전에 차례가 오는 Actor를 순서대로 리턴.
+
+        리턴한 Actor는 반복이 다음으로 넘어갈 때 자기 속도로 다시 예약된다.
+        그 사이에 예약이 취소되거나(죽거나 잠듦) 다시 예약된 Actor는 그대로 둔다.
+        빠른 Actor는 `actor`의 차례 전에 여러번 나올 수 있다.
+        반복 중에 `actor`와 같은 시각으로 다시 예약된 Actor도 `actor`보다 먼저 나온다.
+        """
+        until = self._entries.get(actor)
+        if until is None:
+            return
+        until_time, until_sequence = until[0], until[1]
+
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            entry = heap[0]
+            if entry[0] > until_time or (entry[0] == until_time and entry[1] >= until_sequence):
+                break
+            next_actor = entry[2]
+            if next_actor is None:
+                heapq.heappop(heap)  # 취소된 항목
+                continue
+
+            # 행동하는 동안 새로 예약되는 항목은 모두 이 항목보다 뒤이므로 이 항목은 힙의 맨 앞에 남는다.
+            self.time = entry[0]
+            yield next_actor
+
+            if entries.get(next_actor) is entry:
+                # 항목을 다음 차례로 고쳐서 제자리로 내림, 취소된 항목은 다음 반복에서 버린다.
+                entry[0] += action_delay(next_actor.speed)
+                entry[1] = self._sequence
+                self._sequence += 1
+                heapq.heapreplace(heap, entry)
+                if entry[0] == until_time and entries.get(actor) is until:
+                    # 나중에 예약된 항목은 같은 시각의 actor 뒤로 가므로, actor를 다시 예약해서 그 뒤로 보낸다.
+                    self._push(actor, until_time)
+                    until = entries[actor]
+                    until_sequence = until[1]
+
+        self.time = until_time
+
+    def fork(self, clones: Dict[Actor, Actor]) -> TurnScheduler:
+        """예약된 Actor를 `clones`의 복제본으로 바꾼 복제본을 리턴"""
+        fork = TurnScheduler()
+        fork.time = self.time
+        fork._sequence = self._sequence
+        for actor, (time, sequence, _) in self._entries.items():
+            fork._entries[clones[actor]] = [time, sequence, clones[actor]]
+        fork._compact()
+        return fork
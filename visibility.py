@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, Set, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entity import Entity
+    from game_map import GameMap
+
+
+class VisibilityIndex:
+    """
+    플레이어 시야 안의 엔티티와, 지난 갱신 이후 시야에 들어오거나 나간 엔티티.
+
+    Engine.update_fov가 시야를 갱신할 때마다 한번 다시 만들고, 적을 깨우기, 발견 메세지, 그리기가 같이 쓴다.
+    """
+
+    def __init__(self):
+        self.game_map: Optional[GameMap] = None  # 마지막으로 갱신한 맵
+        self.entities: Set[Entity] = set()  # 시야 안의 엔티티
+        self.entered: Set[Entity] = set()  # 이번 갱신에서 시야에 들어온 엔티티
+        self.left: Set[Entity] = set()  # 이번 갱신에서 시야에서 나간 엔티티
+
+    def update(self, game_map: GameMap, entities: Iterable[Entity]) -> None:
+        """game_map에서 지금 시야 안에 있는 `entities`로 갱신"""
+        current = set(entities)
+        self.game_map = game_map
+        self.entered = current - self.entities
+        self.left = self.entities - current
+        self.entities = current